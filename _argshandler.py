@@ -0,0 +1,340 @@
+'''
+argshandler
+
+Example
+
+>>> class SubA(argshandler(sig='self, b, c')):
+...    def __init__(self, _self, b, c, **kwargs):
+...        super(SubA, self).__init__(_self, b, c)
+
+>>> class A():
+...    def __init__(self):
+...        pass
+...    @SubA.serve(args=['self', 'b', 'c'], callback=lambda *args, **kwargs: args[0])
+...    def func(self, a, b, *args, c, d=None, **kwargs):
+...        print(a, b, args, c, d, kwargs)
+...    def create_subA(self, b, c):
+...        return SubA(self, b, c)
+
+>>> a = A()
+>>> a.create_subA(b='b', c='c').func('a', 1, 2, 3, d='dd', foo='bar')
+
+'''
+# --- built in ---
+import sys
+import weakref
+import inspect
+import threading
+
+# --- 3rd party ---
+
+# --- my module ---
+from ._core import _forge_func
+from ._core import _instrument
+from ._core import _SignatureInfo
+from ._core import _signature_info
+from ._core import _signature_scode
+from ._core import _signature_text_info
+
+
+class _all:
+    def __str__(self):
+        return 'all'
+
+class _self:
+    def __str__(self):
+        return 'self'
+
+def _argshandler__init__(self, *args, **kwargs):
+    self._argshandler_bound_args = self._handler_sig.bind(*args, **kwargs)
+    self._argshandler_bound_args.apply_defaults()
+    _argshandler_freeze(self)
+
+def _argshandler_freeze(self):
+    # frozen copy read by the served functions, so that calls never touch the
+    # bound arguments: the values in signature order
+    self._argshandler_values = tuple(self._argshandler_bound_args.arguments.values())
+
+# set by _argshandler_freeze
+_argshandler_frozen_attributes = ('_argshandler_values',)
+
+def _argshandler__setstate__(self, state):
+    self.__dict__.update(state)
+    if '_argshandler_bound_args' in state:
+        _argshandler_freeze(self)
+
+def _argshandler__reduce_ex__(self, protocol):
+    # the frozen attributes are rebuilt by __setstate__ or __init__
+    state = {k: v for k, v in vars(self).items() if k not in _argshandler_frozen_attributes}
+
+    if '_argshandler_key' not in type(self).__dict__:
+        # subclasses are resolved by their module path
+        reduced = object.__reduce_ex__(self, protocol)
+        return reduced[:2] + (state or None,) + reduced[3:]
+
+    identity = _argshandler_identity(type(self))
+    if len(_argshandler_lookup(identity)) > 1:
+        import pickle
+
+        raise pickle.PicklingError('cannot pickle {!r}: several ArgsHandler classes of module {!r} have '
+                                   'the signature {} and serve the same functions'.format(
+                                                            self, identity[0], identity[1]))
+
+    bound = self._argshandler_bound_args
+    state.pop('_argshandler_bound_args', None)
+
+    return (_rebuild_argshandler, (identity, bound.args, bound.kwargs), state or None)
+
+# (str(sig), baseclass) -> ArgsHandler classes, held weakly
+_argshandler_registry = {}
+_argshandler_registry_lock = threading.RLock()
+
+def _argshandler_identity(cls):
+    '''
+    Identify an ArgsHandler class across processes: (module that created it,
+    signature, base classes, (module, qualname) of the functions it serves)
+    '''
+    return cls._argshandler_key + (tuple(sorted(set(cls._argshandler_served))),)
+
+def _argshandler_lookup(identity):
+    # the live ArgsHandler classes of `identity`
+    with _argshandler_registry_lock:
+        classes = list(_argshandler_registry.get(identity[1:3], ()))
+    return [cls for cls in classes if _argshandler_identity(cls) == identity]
+
+def _rebuild_argshandler(identity, args, kwargs):
+    '''
+    Unpickle an instance of an ArgsHandler class
+
+    The class is looked up by its identity, see _argshandler_identity. The modules
+    that created the class and define the functions it serves are imported first
+    if the class does not exist in this process yet.
+    '''
+    classes = _argshandler_lookup(identity)
+    if not classes:
+        import importlib
+
+        module, _, _, served = identity
+        for name in [module] + [served_module for served_module, _ in served]:
+            importlib.import_module(name)
+        classes = _argshandler_lookup(identity)
+
+    if len(classes) != 1:
+        import pickle
+
+        raise pickle.UnpicklingError('{} ArgsHandler classes of module {!r} have the signature {} '
+                                     'and serve {}'.format(len(classes), identity[0], identity[1],
+                                        ', '.join('{}.{}'.format(*f) for f in identity[3]) or 'no function'))
+
+    return classes[0](*args, **kwargs)
+
+def _argshandler_serve(cls, args=_all, callback=_self):
+    '''
+    serve
+
+    Args:
+        cls: class object
+        args: (list of str) argument name to serve
+        callback: (Function) callback function
+    '''
+    if args is _all:
+        args = list(cls._handler_info.names)
+        #args = list(self._argshandler_bound_args.arguments.keys())
+
+    def _generate_func(func, callback):
+        '''
+        Generate function
+        Args:
+            func: (Function) target function
+            callback: (Function) callback function
+        '''
+
+        _argshandler_func_scode_template='''\
+{async_prefix}def _gened_func({signature}):
+    {instrument_enter_code}
+{bound_code}
+{call_code}
+'''
+        func_info = _signature_info(func)
+        func_sig = func_info.signature
+        # position of the handler arguments in _argshandler_values
+        handler_index = cls._handler_info.index
+        target_args = [inspect.Parameter('_argshandler_self', inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+
+        # remove not served args
+        for param in func_info.parameters:
+            if param.name not in args:
+                target_args.append(param)
+
+
+        # create signature
+        target_sig = func_sig.replace(parameters=target_args)
+
+        # Pass arguments straight to func, in the same way inspect.BoundArguments
+        # would: served arguments are read from the handler, the others come from
+        # the caller. Arguments come positionally until the first keyword-only
+        # parameter or the first served argument the handler does not have.
+        positional_list = []
+        keyword_list = []
+        need_bound = False
+        kwargs_started = False
+
+        for param in func_info.parameters:
+            name = param.name
+
+            if name not in args:
+                value = name
+            elif name in handler_index:
+                value = '_argshandler_values[{}]'.format(handler_index[name])
+                need_bound = True
+            else:
+                # served argument missing from the handler
+                kwargs_started = True
+                continue
+
+            if param.kind in (param.VAR_KEYWORD, param.KEYWORD_ONLY):
+                kwargs_started = True
+
+            if not kwargs_started:
+                if param.kind == param.VAR_POSITIONAL:
+                    positional_list.append('*' + value)
+                else:
+                    positional_list.append(value)
+            elif param.kind == param.VAR_KEYWORD:
+                keyword_list.append((None, value))
+            else:
+                keyword_list.append((name, value))
+
+        bound_code = ''
+        if need_bound:
+            bound_code = '    _argshandler_values = _argshandler_self._argshandler_values'
+
+        namespace_dict = {
+            '_argshandler_func': func,
+            '_argshandler_callback': callback,
+        }
+
+        qualname = getattr(func, '__qualname__', func.__name__)
+        enter_code, call_template = _instrument('serve', qualname, namespace_dict)
+
+        # coroutine functions are awaited, which makes the wrapper a coroutine function
+        func_await = 'await ' if inspect.iscoroutinefunction(func) else ''
+        callback_await = 'await ' if inspect.iscoroutinefunction(callback) else ''
+
+        # callback
+        if callback is None or callback is _self:
+            call = call_template.format(call='{}_argshandler_func({})'.format(func_await, ', '.join(positional_list + [
+                        '**' + v if k is None else '{}={}'.format(k, v) for k, v in keyword_list])))
+
+            if callback is None:
+                call_code = '    return {}'.format(call)
+            else:
+                call_code = '    {}\n    return _argshandler_self'.format(call)
+        else:
+            # the callback receives the arguments func was called with
+            call_code = (
+                '    _argshandler_args = ({})\n'
+                '    _argshandler_kwargs = {{{}}}\n'
+                '    returns = {}\n'
+                '    return {}_argshandler_callback(_argshandler_self, returns, '
+                        '*_argshandler_args, **_argshandler_kwargs)'
+            ).format(''.join('{}, '.format(p) for p in positional_list),
+                     ', '.join('**' + v if k is None else '{!r}: {}'.format(k, v) for k, v in keyword_list),
+                     call_template.format(call=func_await + '_argshandler_func(*_argshandler_args, **_argshandler_kwargs)'),
+                     callback_await)
+
+
+        kwargs_dict = {
+            'async_prefix': 'async ' if func_await or callback_await else '',
+            'signature': _signature_scode(target_sig, namespace_dict),
+            'instrument_enter_code': enter_code,
+            'bound_code': bound_code,
+            'call_code': call_code
+        }
+
+        gened_func = _forge_func('_gened_func', 
+                                 _argshandler_func_scode_template, 
+                                 kwargs_dict, 
+                                 namespace_dict,
+                                 kind='serve',
+                                 qualname=qualname)
+
+        gened_func.signature = target_sig
+        gened_func.func = func
+        gened_func.func_sig = func_sig
+        gened_func.callback = callback
+
+        return gened_func
+
+    def _update_func(gen_func, target_obj=None, ori_func=None):
+
+        # update func info
+        if ori_func is not None:
+            if getattr(ori_func, '__name__', None):
+                setattr(gen_func, '__name__', ori_func.__name__)
+
+            if getattr(ori_func, '__doc__', None):
+                setattr(gen_func, '__doc__', ori_func.__doc__)
+
+        if target_obj is not None:
+            setattr(gen_func, '__qualname__', '.'.join([target_obj.__qualname__, gen_func.__name__]))
+            setattr(gen_func, '__module__', target_obj.__module__)
+
+
+    def _attach_func(target_obj, gen_func, ismethod=True):
+
+        #if ismethod:
+        #    setattr(target_obj, gen_func.__name__, types.MethodType(gen_func, target_obj))
+        #else:
+        setattr(target_obj, gen_func.__name__, gen_func)
+
+    def _wrapper(func):
+
+        gened_func = _generate_func(func, callback)
+        _update_func(gened_func, cls, func)
+        _attach_func(cls, gened_func)
+
+        # identifies the class when unpickling, see _argshandler_identity
+        served = cls.__dict__.get('_argshandler_served')
+        if served is not None:
+            served.append((func.__module__, func.__qualname__))
+
+        return func
+
+    return _wrapper
+
+
+
+def _argshandler_signature(sig):
+    # analyze signature, strings are parsed once
+    if sig is None:
+        sig = '*args, **kwargs'
+
+    if isinstance(sig, str):
+        return _signature_text_info(sig)
+
+    assert isinstance(sig, inspect.Signature), 'sig must be an inspect.Signature'
+
+    return _SignatureInfo(sig)
+
+def argshandler(sig=None, baseclass=()):
+    handler_info = _argshandler_signature(sig)
+
+    cls = type('ArgsHandler',
+               baseclass,
+               {'_handler_sig': handler_info.signature,
+                '_handler_info': handler_info,
+                # (module calling argshandler(), str(sig), baseclass) and the functions
+                # served, see _argshandler_identity
+                '_argshandler_key': (sys._getframe(1).f_globals.get('__name__'), handler_info.text,
+                                     tuple(baseclass)),
+                '_argshandler_served': [],
+                '__init__': _argshandler__init__,
+                '__reduce_ex__': _argshandler__reduce_ex__,
+                '__setstate__': _argshandler__setstate__,
+                'serve': classmethod(_argshandler_serve)})
+
+    with _argshandler_registry_lock:
+        _argshandler_registry.setdefault(cls._argshandler_key[1:], weakref.WeakSet()).add(cls)
+
+    return cls
@@ -0,0 +1,333 @@
+'''
+PackBatch: columnar batches of packs with the same fields.
+'''
+# --- built in ---
+import operator
+import itertools
+import functools
+
+# --- 3rd party ---
+
+# --- my module ---
+from ._pack import ParameterPack
+from ._serialize import _pack_to_bytes
+
+
+@functools.lru_cache(maxsize=None)
+def _import_numpy():
+    # numpy is optional, PackBatch stores columns in lists without it
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+_numeric_types = (bool, int, float)
+
+class PackBatch:
+    '''
+    PackBatch
+
+    A columnar batch of packs with the same fields: ParameterPack, CompactParameterPack,
+    ParameterPackView or dictionarized instances. Each field is stored in a column, which
+    is a numpy array if numpy is installed and the values of the field are all bool, all
+    int or all float, or a list otherwise. Rows read back the values with their type.
+
+    >>> batch = PackBatch(obj.args for obj in objects)
+    >>> batch['x']                          # column
+    >>> batch[batch['x'] > 3]               # rows where x > 3, numpy only
+    >>> batch.filter(x=lambda x: x > 3)     # same, with or without numpy
+    >>> batch.aggregate('x', 'mean')
+    >>> batch[0].x                          # row
+
+    Selecting rows returns a batch which only copies the columns it reads.
+    '''
+
+    _aggregates = ('sum', 'mean', 'min', 'max')
+
+    def __init__(self, packs=(), fields=None, use_numpy=True):
+        '''
+        Args:
+            packs: (iterable) packs to collect
+            fields: (iterable of str or None) field names. If None, the fields of the
+                first pack are used.
+            use_numpy: (bool) whether to store numeric columns in numpy arrays
+        '''
+        self._fields = tuple(fields) if fields is not None else None
+        # list or numpy array per field, or None until taken from _source
+        self._columns = None if fields is None else [[] for _ in self._fields]
+        self._source = None
+        self._indices = None
+        self._has_arrays = False
+        self._size = 0
+        self._numpy = _import_numpy() if use_numpy else None
+        self.extend(packs)
+
+    @property
+    def fields(self):
+        return self._fields or ()
+
+    def _column_data(self, index):
+        column = self._columns[index]
+        if column is None:
+            # take the rows of this batch from the source batch
+            source = self._source.column(self._fields[index])
+            if type(source) is list:
+                if len(self._indices):
+                    column = list(operator.itemgetter(*self._indices)(source)) if len(self._indices) > 1 \
+                                else [source[self._indices[0]]]
+                else:
+                    column = []
+            else:
+                column = source[self._indices]
+                self._has_arrays = True
+            self._columns[index] = column
+        return column
+
+    def append(self, pack):
+        '''
+        Append a pack, which must have the same fields as the batch
+        '''
+        keys = tuple(pack.keys())
+        if self._fields is None:
+            self._fields = keys
+            self._columns = [[] for _ in keys]
+        elif keys != self._fields:
+            raise ValueError('fields {} do not match {}'.format(keys, self._fields))
+
+        if self._source is not None or self._has_arrays:
+            # back to lists
+            self._columns = [self._column_data(index) for index in range(len(keys))]
+            self._columns = [column if type(column) is list else column.tolist() for column in self._columns]
+            self._source = self._indices = None
+            self._has_arrays = False
+
+        for column, value in zip(self._columns, pack.values()):
+            column.append(value)
+        self._size += 1
+
+    def extend(self, packs):
+        for pack in packs:
+            self.append(pack)
+
+    def __len__(self):
+        return self._size
+
+    def __repr__(self):
+        return 'PackBatch(fields={}, rows={})'.format(self.fields, len(self))
+
+    def column(self, field):
+        '''
+        Return the column of `field`: a numpy array if numpy is used and the values are
+        all bool, all int or all float, or a list. Do not modify it.
+        '''
+        try:
+            index = self._fields.index(field)
+        except (AttributeError, ValueError):
+            raise KeyError(field) from None
+
+        column = self._column_data(index)
+
+        # mixed types stay in a list, an array would coerce them, e.g. [1, 2.5] to floats
+        if (self._numpy is not None and type(column) is list and column
+                and type(column[0]) in _numeric_types
+                and all(type(value) is type(column[0]) for value in column)):
+            array = self._numpy.asarray(column)
+            # e.g. ints that do not fit in int64 stay in a list
+            if array.dtype != object:
+                self._columns[index] = column = array
+                self._has_arrays = True
+
+        return column
+
+    def _take(self, indices):
+        batch = PackBatch(fields=self._fields, use_numpy=self._numpy is not None)
+        batch._columns = [None] * len(self._fields)
+        batch._source = self
+        batch._indices = indices
+        batch._size = len(indices)
+        return batch
+
+    def __getitem__(self, key):
+        '''
+        batch[field] -> column
+        batch[index] -> row
+        batch[slice or boolean mask or sequence of indices] -> PackBatch
+        '''
+        if isinstance(key, str):
+            return self.column(key)
+
+        numpy = self._numpy
+
+        if isinstance(key, int) or (numpy is not None and isinstance(key, numpy.integer)):
+            if not -self._size <= key < self._size:
+                raise IndexError('row index out of range')
+            return PackRow(self, int(key) % self._size)
+
+        if isinstance(key, slice):
+            key = range(*key.indices(self._size))
+        elif numpy is not None and isinstance(key, numpy.ndarray) and key.dtype == bool:
+            key = numpy.flatnonzero(key)
+        elif len(key) == self._size and all(type(k) is bool for k in key):
+            key = list(itertools.compress(range(self._size), key))
+
+        if numpy is not None:
+            key = numpy.asarray(key, dtype=numpy.intp)
+        else:
+            key = list(key)
+
+        return self._take(key)
+
+    def __iter__(self):
+        for index in range(self._size):
+            yield PackRow(self, index)
+
+    def mask(self, **conditions):
+        '''
+        Return the boolean mask of rows meeting all conditions
+
+        Args:
+            conditions: field=value to compare the field with a value, or field=callable,
+                which is called with the column and returns a mask (vectorized with numpy
+                columns) or, if it fails, is called with each value
+        '''
+        mask = None
+        for field, condition in conditions.items():
+            column = self.column(field)
+
+            if callable(condition):
+                field_mask = None
+                if type(column) is not list:
+                    try:
+                        field_mask = condition(column)
+                    except TypeError:
+                        pass
+                if field_mask is None:
+                    field_mask = [not not condition(value) for value in column]
+            elif type(column) is list:
+                field_mask = [value == condition for value in column]
+            else:
+                field_mask = column == condition
+
+            if mask is None:
+                mask = field_mask
+            elif type(mask) is list or type(field_mask) is list:
+                mask = [a and b for a, b in zip(mask, field_mask)]
+            else:
+                mask = mask & field_mask
+
+        if mask is None:
+            mask = [True] * self._size
+        if self._numpy is not None:
+            mask = self._numpy.asarray(mask, dtype=bool)
+        return mask
+
+    def filter(self, **conditions):
+        '''
+        Return a new PackBatch of the rows meeting all conditions, see mask()
+        '''
+        return self[self.mask(**conditions)]
+
+    def aggregate(self, field, how):
+        '''
+        Aggregate a column
+
+        Args:
+            field: (str) field name
+            how: (str or callable) one of 'sum', 'mean', 'min', 'max', or a function
+                called with the column
+        '''
+        column = self.column(field)
+
+        if callable(how):
+            return how(column)
+
+        if how not in self._aggregates:
+            raise ValueError('unknown aggregate: {!r}'.format(how))
+
+        if type(column) is not list:
+            return getattr(column, how)().item()
+
+        if how == 'mean':
+            return sum(column) / len(column)
+        return {'sum': sum, 'min': min, 'max': max}[how](column)
+
+    def to_packs(self):
+        '''
+        Return a list of ParameterPack, one per row
+        '''
+        return [row._asdict() for row in self]
+
+
+class PackRow:
+    '''
+    PackRow
+
+    A read-only view of a row of a PackBatch, which reads like a ParameterPack: values
+    can be unpacked in order and read by attribute or by name.
+    '''
+
+    __slots__ = ('_batch', '_index')
+
+    def __init__(self, batch, index):
+        self._batch = batch
+        self._index = index
+
+    def __getitem__(self, key):
+        try:
+            index = self._batch._fields.index(key)
+        except ValueError:
+            raise KeyError(key) from None
+        return self._value(index)
+
+    def _value(self, index):
+        column = self._batch._column_data(index)
+        if type(column) is list:
+            return column[self._index]
+        # numpy scalar
+        return column[self._index].item()
+
+    def __getattr__(self, name):
+        if name not in PackRow.__slots__:
+            try:
+                return self[name]
+            except KeyError:
+                pass
+        raise AttributeError('{!r} object has no attribute {!r}'.format(self.__class__.__name__, name))
+
+    def __contains__(self, key):
+        return key in self._batch._fields
+
+    def __iter__(self):
+        for index in range(len(self._batch._fields)):
+            yield self._value(index)
+
+    def __len__(self):
+        return len(self._batch._fields)
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, ', '.join(
+                    '{}={!r}'.format(f, v) for f, v in self.items()) )
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return self._batch._fields
+
+    def values(self):
+        return tuple(self)
+
+    def items(self):
+        return tuple(zip(self._batch._fields, self))
+
+    def _asdict(self):
+        '''
+        Return a new ParameterPack which maps field names to their values
+        '''
+        return ParameterPack(self.items())
+
+    to_bytes = _pack_to_bytes
@@ -0,0 +1,709 @@
+'''
+Forging: compiling rendered source code, the on-disk code cache, ahead-of-time
+forged code, instrumentation and the signature analysis shared by every API.
+'''
+# --- built in ---
+import os
+import sys
+import time
+import zlib
+import types
+import weakref
+import inspect
+import linecache
+import threading
+import functools
+import collections
+
+# --- 3rd party ---
+
+# --- my module ---
+
+
+class _ForgeCache:
+    '''
+    On-disk cache of compiled forged code
+
+    Each rendered source is compiled once and its code object is marshaled into
+    `path`. The cache key is a hash of the rendered source, the filename it is
+    compiled under and the interpreter version, so entries written by another
+    interpreter are never loaded. Corrupted or stale entries are treated as
+    misses and removed. Once the total size exceeds `max_size` bytes, the least
+    recently used entries are evicted.
+    '''
+    _magic = b'FRGC'
+    _suffix = '.fcode'
+
+    def __init__(self, path, max_size):
+        from importlib.util import MAGIC_NUMBER
+        import marshal
+
+        self._marshal = marshal
+
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._tag = MAGIC_NUMBER + sys.version.encode()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.path, exist_ok=True)
+        self._size = sum(size for _, _, size in self._entries())
+        if self._size > self.max_size:
+            self._evict()
+
+    def _entries(self):
+        entries = []
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if not entry.name.endswith(self._suffix):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _key(self, source, filename):
+        import hashlib
+
+        digest = hashlib.sha256(self._tag)
+        digest.update(filename.encode())
+        digest.update(b'\0')
+        digest.update(source.encode())
+        return digest.digest()
+
+    def _load(self, filepath, key):
+        try:
+            with open(filepath, 'rb') as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        header = self._magic + key
+        if data[:len(header)] == header:
+            try:
+                code = self._marshal.loads(data[len(header):])
+            except (EOFError, ValueError, TypeError):
+                code = None
+            if isinstance(code, types.CodeType):
+                try:
+                    # refresh mtime for LRU eviction
+                    os.utime(filepath)
+                except OSError:
+                    pass
+                return code
+
+        # invalid entry
+        self._remove(filepath, len(data))
+        return None
+
+    def _store(self, filepath, key, code):
+        data = self._magic + key + self._marshal.dumps(code)
+        tmppath = '{}.{}.tmp'.format(filepath, os.getpid())
+        try:
+            with open(tmppath, 'wb') as f:
+                f.write(data)
+        except OSError:
+            self._discard(tmppath)
+            return
+
+        with self._lock:
+            # another thread may have stored the same entry meanwhile
+            try:
+                replaced = os.stat(filepath).st_size
+            except OSError:
+                replaced = 0
+            try:
+                os.replace(tmppath, filepath)
+            except OSError:
+                self._discard(tmppath)
+                return
+
+            self._size += len(data) - replaced
+            if self._size > self.max_size:
+                self._evict()
+
+    def _discard(self, tmppath):
+        try:
+            os.remove(tmppath)
+        except OSError:
+            pass
+
+    def _remove(self, filepath, size):
+        try:
+            os.remove(filepath)
+        except OSError:
+            return
+        with self._lock:
+            self._size -= size
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        self._size = sum(size for _, _, size in entries)
+        for filepath, _, size in entries:
+            if self._size <= self.max_size:
+                break
+            try:
+                os.remove(filepath)
+            except OSError:
+                continue
+            self._size -= size
+
+    def compile(self, source, filename):
+        '''
+        Compile `source`, loading the code object from disk if it was cached
+        '''
+        key = self._key(source, filename)
+        filepath = os.path.join(self.path, key.hex() + self._suffix)
+
+        code = self._load(filepath, key)
+        with self._lock:
+            if code is not None:
+                self.hits += 1
+                return code
+            self.misses += 1
+
+        code = compile(source, filename, 'exec')
+        self._store(filepath, key, code)
+        return code
+
+    def clear(self):
+        with self._lock:
+            for filepath, _, _ in self._entries():
+                try:
+                    os.remove(filepath)
+                except OSError:
+                    pass
+            self._size = 0
+
+    def info(self):
+        with self._lock:
+            return {
+                'path': self.path,
+                'max_size': self.max_size,
+                'size': self._size,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_forge_cache = None
+
+def enable_forge_cache(path=None, max_size=64*1024*1024):
+    '''
+    Enable the on-disk cache for forged code
+
+    Args:
+        path: (str or None) cache directory. If set to None, $FORGE_CACHE_DIR or
+            ~/.cache/forge is used.
+        max_size: (int) maximum total size of the cache in bytes
+    '''
+    global _forge_cache
+
+    if path is None:
+        path = os.environ.get('FORGE_CACHE_DIR') or os.path.join('~', '.cache', 'forge')
+
+    assert max_size > 0, 'max_size must be a positive integer'
+
+    _forge_cache = _ForgeCache(path, max_size)
+
+def disable_forge_cache():
+    '''
+    Disable the on-disk cache for forged code
+    '''
+    global _forge_cache
+    _forge_cache = None
+
+def clear_forge_cache():
+    '''
+    Remove every entry from the on-disk cache
+    '''
+    if _forge_cache is not None:
+        _forge_cache.clear()
+
+def forge_cache_info():
+    '''
+    Return the on-disk cache statistics, or None if the cache is disabled
+
+    Returns:
+        a dict with keys: path, max_size, size, hits, misses
+    '''
+    if _forge_cache is None:
+        return None
+    return _forge_cache.info()
+
+class _CodeCache:
+    '''
+    In-memory cache of compiled forged code, shared by the threads forging code
+
+    Code objects are keyed by their rendered source only, so that functions with the
+    same signature share a single compilation: the code is compiled once under the
+    filename of the first request and copied under the filename of the others. When
+    several threads request the same source at once, one thread compiles it while
+    the others wait for its result. The least recently used entries are dropped
+    beyond `maxsize` sources.
+    '''
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self._data = collections.OrderedDict()
+        self._compiling = {}
+        self._lock = threading.Lock()
+
+    def compile(self, source, filename):
+        with self._lock:
+            code = self._data.get(source)
+            if code is not None:
+                self.hits += 1
+                self._data.move_to_end(source)
+                return _code_with_filename(code, filename)
+
+            done = self._compiling.get(source)
+            if done is None:
+                self.misses += 1
+                done = self._compiling[source] = threading.Event()
+                owner = True
+            else:
+                self.waits += 1
+                owner = False
+
+        if not owner:
+            done.wait()
+            code = self._data.get(source)
+            if code is None:
+                # the compiling thread failed, compile here to raise the same error
+                return _compile_uncached(source, filename)
+            return _code_with_filename(code, filename)
+
+        try:
+            code = _compile_uncached(source, filename)
+            with self._lock:
+                self._data[source] = code
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        finally:
+            with self._lock:
+                del self._compiling[source]
+            done.set()
+
+        return code
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def info(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'waits': self.waits,
+                'currsize': len(self._data),
+                'maxsize': self.maxsize,
+            }
+
+
+_code_cache = _CodeCache(maxsize=1024)
+
+def _code_with_filename(code, filename):
+    '''
+    Return `code`, with its nested code objects, compiled under `filename`
+    '''
+    if code.co_filename == filename:
+        return code
+    consts = tuple(_code_with_filename(const, filename) if isinstance(const, types.CodeType) else const
+                        for const in code.co_consts)
+    return code.replace(co_filename=filename, co_consts=consts)
+
+def _compile_uncached(source, filename):
+    cache = _forge_cache
+    if cache is None:
+        return compile(source, filename, 'exec')
+    return cache.compile(source, filename)
+
+def _compile_source(source, filename='<string>'):
+    return _code_cache.compile(source, filename)
+
+def _forge_filename(kind, qualname, source):
+    '''
+    Return a filename for forged code, so that profilers and tracebacks can
+    tell forged functions apart, e.g. <forge:dictionarize:func:1a2b3c4d>
+    '''
+    digest = '{:08x}'.format(zlib.crc32(source.encode()))
+    return '<forge:{}:{}:{}>'.format(kind, qualname, digest)
+
+def _forge_func(name, source, kwargs, namespace, kind='forge', qualname=None):
+    '''
+    Render `source` with `kwargs`, execute it with `namespace` as globals and return
+    the object it defines as `name`
+
+    The code runs in a copy of `namespace`, so forging is safe from several threads.
+    Identical rendered sources are compiled once, see _CodeCache.
+    '''
+    rendered = source.format(**kwargs)
+
+    # record the source for forge.aot
+    if _aot_recorder is not None:
+        _aot_recorder.append((kind, qualname or name, name, rendered, tuple(namespace)))
+
+    factory = _aot_forged.get(_aot_key(rendered)) if (_aot_forged or _aot_strict) else None
+
+    if factory is not None:
+        # generated ahead of time
+        func = factory(**namespace)
+    else:
+        if _aot_strict:
+            raise RuntimeError('{} {} was not generated ahead of time, '
+                               'run `python -m forge.aot` again'.format(kind, qualname or name))
+
+        filename = _forge_filename(kind, qualname or name, rendered)
+        code = _compile_source(rendered, filename)
+
+        # make the source available to tracebacks
+        linecache.cache[filename] = (len(rendered), None, rendered.splitlines(True), filename)
+
+        forge_globals = dict(namespace)
+        exec(code, forge_globals)
+
+        func = forge_globals[name]
+
+    func._forge_source = rendered
+
+    # tag call statistics with the source
+    if namespace.get('_forge_stats') is not None:
+        namespace['_forge_stats'].source = rendered
+
+    return func
+
+
+if os.environ.get('FORGE_CACHE_DIR'):
+    enable_forge_cache()
+
+
+# === ahead-of-time forging ===
+
+# source key -> factory generated by forge.aot
+_aot_forged = {}
+_aot_strict = False
+# list of (kind, qualname, name, source, namespace names) while forge.aot imports modules
+_aot_recorder = None
+
+def _aot_key(source):
+    import hashlib
+
+    return hashlib.sha256(source.encode()).hexdigest()
+
+def use_aot(module, strict=False):
+    '''
+    Use the code generated by `python -m forge.aot` instead of compiling it at runtime
+
+    Args:
+        module: (str or module) the generated module
+        strict: (bool) whether to raise RuntimeError, instead of compiling the code at runtime,
+            when the code to forge was not generated ahead of time
+    '''
+    global _aot_strict
+
+    if isinstance(module, str):
+        import importlib
+
+        module = importlib.import_module(module)
+
+    _aot_forged.update(module.FORGED)
+    _aot_strict = strict
+
+
+# === instrumentation ===
+
+class _CallStats:
+    '''
+    Call statistics of a forged function
+    '''
+    __slots__ = ('kind', 'qualname', 'source', 'calls', 'total_time', 'bind_time', '_lock')
+
+    def __init__(self, kind, qualname):
+        self.kind = kind
+        self.qualname = qualname
+        self.source = None
+        self.calls = 0
+        self.total_time = 0.0
+        self.bind_time = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, start, bound, returns):
+        '''
+        Called by instrumented code once the target function returns
+
+        Args:
+            start: (float) time the forged function was entered
+            bound: (float) time the target function was called
+            returns: return value of the target function, passed through
+        '''
+        end = time.perf_counter()
+        with self._lock:
+            self.calls += 1
+            self.total_time += end - start
+            self.bind_time += bound - start
+        return returns
+
+    def asdict(self):
+        return {
+            'kind': self.kind,
+            'qualname': self.qualname,
+            'calls': self.calls,
+            'total_time': self.total_time,
+            'bind_time': self.bind_time,
+            'source': self.source,
+        }
+
+
+_instrumentation_enabled = False
+_call_stats = []
+_call_stats_lock = threading.Lock()
+
+# instrumented code, see _instrument
+_instrument_enter_scode = '_forge_t0 = _forge_clock()'
+_instrument_call_scode = '_forge_stats.record(_forge_t0, _forge_clock(), {call})'
+
+
+def enable_instrumentation():
+    '''
+    Instrument functions forged from now on
+
+    Instrumented functions record their call count, cumulative wall time and the
+    time spent binding arguments before the wrapped function is called. Functions
+    forged while instrumentation is disabled contain no instrumentation code.
+    See stats().
+    '''
+    global _instrumentation_enabled
+    _instrumentation_enabled = True
+
+def disable_instrumentation():
+    '''
+    Stop instrumenting newly forged functions
+
+    Functions forged while instrumentation was enabled keep recording.
+    '''
+    global _instrumentation_enabled
+    _instrumentation_enabled = False
+
+def stats():
+    '''
+    Return the call statistics of instrumented forged functions
+
+    Returns:
+        a list of dicts sorted by total_time, with keys:
+            kind: (str) 'dictionarize', 'pack' or 'serve'
+            qualname: (str) qualified name of the original function
+            calls: (int) number of completed calls
+            total_time: (float) cumulative wall time in seconds
+            bind_time: (float) cumulative time spent before calling the original function, in seconds
+            source: (str) the forged source code
+    '''
+    with _call_stats_lock:
+        records = [record.asdict() for record in _call_stats]
+    return sorted(records, key=lambda record: record['total_time'], reverse=True)
+
+def reset_stats():
+    '''
+    Reset the call statistics of instrumented forged functions
+    '''
+    with _call_stats_lock:
+        for record in _call_stats:
+            with record._lock:
+                record.calls = 0
+                record.total_time = 0.0
+                record.bind_time = 0.0
+
+def _instrument(kind, qualname, namespace):
+    '''
+    Prepare instrumentation of a function about to be forged
+
+    Args:
+        kind: (str) forging API
+        qualname: (str) qualified name of the original function
+        namespace: (dict) namespace of the forged function, updated in place
+
+    Returns:
+        (enter_code, call_template). `enter_code` must be placed at the top of the
+        forged function and every call to the original function must be formatted
+        with `call_template.format(call=...)`. Both are no-ops if instrumentation is
+        disabled.
+    '''
+    if not _instrumentation_enabled:
+        return '', '{call}'
+
+    record = _CallStats(kind, qualname)
+    with _call_stats_lock:
+        _call_stats.append(record)
+
+    namespace['_forge_stats'] = record
+    namespace['_forge_clock'] = time.perf_counter
+
+    return _instrument_enter_scode, _instrument_call_scode
+
+
+# === signature analysis ===
+
+class _SignatureInfo:
+    '''
+    Parameters of a signature, classified once and shared by every forging path
+
+    Attributes:
+        signature: (inspect.Signature) the analyzed signature
+        text: (str) str(signature)
+        parameters: (tuple of inspect.Parameter) parameters, in order
+        names: (tuple of str) parameter names, in order
+        index: (mappingproxy) parameter name to its position in names
+        positional: (tuple of str) positional-only and positional-or-keyword parameters
+        var_positional: (str) name of the variable-length positional parameter, or None
+        keyword_only: (tuple of str) keyword-only parameters
+        var_keyword: (str) name of the variable-length keyword parameter, or None
+        scode: (str) the parameters rendered by _signature_scode
+        defaults: (mappingproxy) the namespace entries scode refers to
+        call_scode: (str) the arguments rendered by _call_scode
+    '''
+    __slots__ = ('signature', 'text', 'parameters', 'names', 'index', 'positional',
+                 'var_positional', 'keyword_only', 'var_keyword', 'scode', 'defaults',
+                 'call_scode')
+
+    def __init__(self, sign):
+        parameters = tuple(sign.parameters.values())
+        defaults = {}
+
+        init = object.__setattr__
+        init(self, 'signature', sign)
+        init(self, 'text', str(sign))
+        init(self, 'parameters', parameters)
+        init(self, 'names', tuple(param.name for param in parameters))
+        init(self, 'index', types.MappingProxyType({param.name: idx for idx, param in enumerate(parameters)}))
+        init(self, 'positional', tuple(param.name for param in parameters
+                                       if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD)))
+        init(self, 'var_positional', next((param.name for param in parameters
+                                           if param.kind == param.VAR_POSITIONAL), None))
+        init(self, 'keyword_only', tuple(param.name for param in parameters if param.kind == param.KEYWORD_ONLY))
+        init(self, 'var_keyword', next((param.name for param in parameters
+                                        if param.kind == param.VAR_KEYWORD), None))
+        init(self, 'scode', _signature_scode(sign, defaults))
+        init(self, 'defaults', types.MappingProxyType(defaults))
+        init(self, 'call_scode', _call_scode(sign))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('{} is immutable'.format(type(self).__name__))
+
+    __delattr__ = __setattr__
+
+    def __repr__(self):
+        return '{}{}'.format(type(self).__name__, self.text)
+
+
+# analyses by function, dropped with the function
+_signature_cache = weakref.WeakKeyDictionary()
+
+def _signature_info(function):
+    '''
+    Return the _SignatureInfo of `function`, analyzing it on first use
+
+    Functions that cannot be weakly referenced are analyzed on every call. The
+    analysis is not refreshed if `__signature__` is reassigned afterwards.
+    '''
+    try:
+        return _signature_cache[function]
+    except KeyError:
+        pass
+    except TypeError:
+        return _SignatureInfo(inspect.signature(function))
+
+    info = _SignatureInfo(inspect.signature(function))
+    _signature_cache[function] = info
+    return info
+
+# default values which can be shared by several signatures
+_immutable_default_types = frozenset((int, float, complex, str, bytes, bool, type(None), type(Ellipsis)))
+
+@functools.lru_cache(maxsize=1024)
+def _cached_signature_text_info(text):
+    # (_SignatureInfo, whether a default value is mutable)
+    info = _SignatureInfo(inspect.signature(eval('lambda {}: None'.format(text))))
+    return info, any(type(default) not in _immutable_default_types for default in info.defaults.values())
+
+def _signature_text_info(text):
+    '''
+    Return the _SignatureInfo of the parameter list `text`, e.g. 'a, b=1, *args'
+
+    The analysis is cached by text. If a default value is mutable, e.g. `x=[]`, the
+    text is evaluated again, so that every caller gets its own default objects.
+    '''
+    info, mutable_defaults = _cached_signature_text_info(text)
+    if mutable_defaults:
+        return _SignatureInfo(inspect.signature(eval('lambda {}: None'.format(text))))
+    return info
+
+
+def _signature_scode(sign, namespace):
+    '''
+    Render the parameters of `sign` as source code
+
+    Annotations are dropped and each default value is referenced by a name added to
+    `namespace`, so that the forged function receives the very same default objects.
+
+    Args:
+        sign: (inspect.Signature) signature
+        namespace: (dict) namespace of the forged function, updated in place
+    '''
+    params = []
+    render_pos_only_separator = False
+    render_kw_only_separator = True
+
+    for param in sign.parameters.values():
+        formatted = param.name
+
+        if param.default is not param.empty:
+            default_name = '_forge_default_{}'.format(param.name)
+            namespace[default_name] = param.default
+            formatted = '{}={}'.format(formatted, default_name)
+
+        if param.kind == param.VAR_POSITIONAL:
+            formatted = '*' + formatted
+        elif param.kind == param.VAR_KEYWORD:
+            formatted = '**' + formatted
+
+        if param.kind == param.POSITIONAL_ONLY:
+            render_pos_only_separator = True
+        elif render_pos_only_separator:
+            params.append('/')
+            render_pos_only_separator = False
+
+        if param.kind == param.VAR_POSITIONAL:
+            render_kw_only_separator = False
+        elif param.kind == param.KEYWORD_ONLY and render_kw_only_separator:
+            params.append('*')
+            render_kw_only_separator = False
+
+        params.append(formatted)
+
+    if render_pos_only_separator:
+        params.append('/')
+
+    return ', '.join(params)
+
+def _call_scode(sign):
+    '''
+    Render the arguments to call a function of signature `sign` with the
+    parameters of the same name
+    '''
+    args = []
+    for param in sign.parameters.values():
+        if param.kind == param.VAR_POSITIONAL:
+            args.append('*' + param.name)
+        elif param.kind == param.VAR_KEYWORD:
+            args.append('**' + param.name)
+        elif param.kind == param.KEYWORD_ONLY:
+            args.append('{0}={0}'.format(param.name))
+        else:
+            args.append(param.name)
+    return ', '.join(args)
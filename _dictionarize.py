@@ -0,0 +1,933 @@
+'''
+dictionarize: forge dict subclasses that call a function with their items.
+'''
+# --- built in ---
+import os
+import time
+import weakref
+import inspect
+import itertools
+import threading
+import functools
+import collections
+
+from collections import OrderedDict
+
+# --- 3rd party ---
+
+# --- my module ---
+from . import _core
+from ._core import _forge_func
+from ._core import _instrument
+from ._core import _signature_info
+from ._serialize import _pack_to_bytes
+from ._serialize import _pack_from_bytes
+from ._serialize import _dict_from_fields
+
+
+# === result cache ===
+
+_missing = object()
+
+class LRU:
+    '''
+    Result cache policy of dictionarize: keep the `maxsize` most recently used results
+    '''
+    def __init__(self, maxsize=128):
+        assert isinstance(maxsize, int) and maxsize > 0, 'maxsize must be a positive integer'
+        self.maxsize = maxsize
+
+    def _create(self):
+        return _ResultCache(self.maxsize, None)
+
+    def _key(self):
+        return (LRU, self.maxsize)
+
+    def __eq__(self, other):
+        return isinstance(other, (LRU, TTL)) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return 'LRU(maxsize={})'.format(self.maxsize)
+
+class TTL:
+    '''
+    Result cache policy of dictionarize: keep results for `seconds`, and at most
+    `maxsize` results if it is not None, dropping the oldest ones first
+    '''
+    def __init__(self, seconds, maxsize=None):
+        assert seconds > 0, 'seconds must be positive'
+        assert maxsize is None or (isinstance(maxsize, int) and maxsize > 0), 'maxsize must be a positive integer'
+        self.seconds = seconds
+        self.maxsize = maxsize
+
+    def _create(self):
+        return _ResultCache(self.maxsize, self.seconds)
+
+    def _key(self):
+        return (TTL, self.seconds, self.maxsize)
+
+    __eq__ = LRU.__eq__
+    __hash__ = LRU.__hash__
+
+    def __repr__(self):
+        return 'TTL(seconds={}, maxsize={})'.format(self.seconds, self.maxsize)
+
+class _ResultCache:
+    '''
+    Thread-safe result cache of a dictionarized class
+
+    Keys are (items of the instance, input arguments). Without ttl, the entries are in
+    LRU order. With ttl, they are in insertion order, i.e. expiry order.
+    '''
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (result, expiry time or None)
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                if self.ttl is None:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                if entry[1] > time.monotonic():
+                    self.hits += 1
+                    return entry[0]
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, result):
+        with self._lock:
+            if self.ttl is None:
+                self._data[key] = (result, None)
+                self._data.move_to_end(key)
+            else:
+                now = time.monotonic()
+                self._data.pop(key, None)
+                self._data[key] = (result, now + self.ttl)
+                # drop expired entries
+                while self._data:
+                    oldest = next(iter(self._data.values()))
+                    if oldest[1] > now:
+                        break
+                    self._data.popitem(last=False)
+
+            if self.maxsize is not None:
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+
+    def invalidate(self, obj):
+        '''
+        Drop the results cached for the current content of `obj`
+        '''
+        try:
+            items = tuple(dict.items(obj))
+            hash(items)
+        except TypeError:
+            return
+        with self._lock:
+            for key in [key for key in self._data if key[0] == items]:
+                del self._data[key]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def info(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'currsize': len(self._data),
+                'maxsize': self.maxsize,
+                'ttl': self.ttl,
+            }
+
+
+_dictionarize_scode_template = '''\
+from builtins import dict as _dict
+from builtins import len as _len
+from builtins import property as _property
+from builtins import classmethod as _classmethod
+from builtins import tuple as _tuple
+from operator import itemgetter as _itemgetter
+
+
+class {class_name}(dict):
+    \'\'\'Dictionarized {func_name}{signature}\'\'\'
+
+    __slots__ = ()
+
+    def __new__(_cls, {param_list}):
+        \'\'\'
+        Instantiate new object
+        \'\'\'
+        return _dict.__new__(_cls)
+
+    def __init__(self, {param_list}):
+        super({class_name}, self).__init__({{ {kwargs_list} }})
+
+    {async_prefix}def __call__(self, {input_param_list} **_) {return_annotation}:
+        \'\'\'
+        Call function
+        \'\'\'
+        {instrument_enter_code}
+
+        if not _ and _len(self) == {num_fields}:
+            # no overrides: pass the stored fields directly, unless a field
+            # was replaced by another key
+            try:
+{fast_hoist_code}
+            except KeyError:
+                pass
+            else:
+{fast_return_code}
+
+        _ = {{**self, **_}}
+
+        {pop_args} # pop args from _
+
+        return {call}
+
+    def _map_chunk(self, chunk):
+        \'\'\'
+        Return [self(*inputs) for inputs in chunk]
+        \'\'\'
+        if {chunk_fallback}:
+            return [self(*_inputs) for _inputs in chunk]
+
+        # read the stored fields once for the whole chunk
+        try:
+{hoist_code}
+        except KeyError:
+            # a field was replaced by another key
+            return [self(*_inputs) for _inputs in chunk]
+
+        {async_prefix}def _call({input_param_list}):
+            {instrument_enter_code}
+            return {chunk_call}
+
+        return [_call(*_inputs) for _inputs in chunk]
+
+    def map(self, iterable, executor=None, chunksize=128):
+        \'\'\'
+        Lazily call self(*inputs) for each inputs in iterable, in order
+
+        Args:
+            iterable: (iterable of tuple) the input arguments of each call
+            executor: (concurrent.futures.Executor or None) run chunks of calls in
+                this executor. If None, calls run serially in the current thread.
+            chunksize: (int) number of calls per chunk
+
+        Raises TypeError if the function is a coroutine function, use amap() instead.
+        \'\'\'
+        return _map(self, iterable, executor, chunksize)
+
+    def amap(self, iterable, limit=64, executor=None):
+        \'\'\'
+        Asynchronously call self(*inputs) for each inputs in iterable, in order
+
+        Args:
+            iterable: (iterable of tuple) the input arguments of each call
+            limit: (int) maximum number of calls running concurrently
+            executor: (concurrent.futures.Executor or None) executor running the calls
+                if the function is not a coroutine function. If None, the event loop's
+                default executor is used.
+        \'\'\'
+        return _amap(self, iterable, limit, executor)
+
+{cache_methods}
+    def __reduce__(self):
+        if type(self) is not {class_name}:
+            # subclasses are resolved by their module path
+            return (_dict.__new__, (type(self),), None, None, iter(self.items()))
+        # rebuilt by dictionarize() on unpickling
+        return (_rebuild, _forge_args_value + (_dict(self),))
+
+    def __repr__(self):
+        return '{class_name}({{}})'.format(', '.join(
+                    '{{}}={{!r}}'.format(f, v) for f, v in self.items()) )
+
+    to_bytes = _to_bytes
+    from_bytes = _classmethod(_from_bytes)
+    _from_fields = _classmethod(_dict_from_fields_impl)
+
+    _input_fields = [{input_fields}]
+    _fields = [{param_fields}]
+    # (function, name, inputs, cache)
+    _forge_args = _forge_args_value
+
+    # === properties ===
+
+{property_list}
+'''
+
+_property_scode_template = '''\
+    {property_name} = _property(_itemgetter({property_name!r}), doc='Alias for property {property_name}')
+'''
+
+_fast_return_scode_template = '''\
+                return {fast_call}'''
+
+_cached_fast_return_scode_template = '''\
+                try:
+                    _key = (_tuple(_dict.items(self)), {input_key})
+                    _result = _cache.get(_key, _missing)
+                except TypeError:
+                    # unhashable arguments
+                    return {fast_call}
+                if _result is _missing:
+                    _result = {fast_call}
+                    _cache.put(_key, _result)
+                return _result'''
+
+_cache_methods_scode_template = '''\
+    def __setitem__(self, key, value):
+        _cache.invalidate(self)
+        _dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        _cache.invalidate(self)
+        _dict.__delitem__(self, key)
+
+    @_classmethod
+    def cache_info(cls):
+        \'\'\'
+        Return the result cache statistics: hits, misses, hit_rate, currsize, maxsize, ttl
+        \'\'\'
+        return _cache.info()
+
+    @_classmethod
+    def cache_clear(cls):
+        \'\'\'
+        Remove every cached result
+        \'\'\'
+        _cache.clear()
+'''
+
+
+class _DictionarizeRegistry:
+    '''
+    LRU registry of dictionarized classes
+
+    Forged classes are looked up by the function they wrap in a WeakKeyDictionary,
+    so nothing is stored on the function. Forged classes refer to their function,
+    so a function stays alive while one of its classes is registered: the registry
+    keeps at most `maxsize` classes and forgets a function once its last class is
+    evicted.
+    '''
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        # function -> {key: forged class}
+        self._classes = weakref.WeakKeyDictionary()
+        # (weakref to function, key) -> None, in LRU order
+        self._order = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _entries(self, function):
+        try:
+            return self._classes.get(function)
+        except TypeError:
+            # not weak referenceable
+            return None
+
+    def get(self, function, key):
+        if self.maxsize <= 0:
+            return None
+
+        with self._lock:
+            entries = self._entries(function)
+            if entries is None or key not in entries:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._order.move_to_end((weakref.ref(function), key))
+            return entries[key]
+
+    def put(self, function, key, forged_class):
+        '''
+        Register `forged_class` unless another thread registered a class for the same
+        function and key first
+
+        Returns:
+            the registered class, which callers must use instead of `forged_class`
+        '''
+        if self.maxsize <= 0:
+            return forged_class
+
+        with self._lock:
+            entries = self._entries(function)
+            if entries is None:
+                try:
+                    entries = self._classes[function] = {}
+                except TypeError:
+                    # not weak referenceable
+                    return forged_class
+
+            forged_class = entries.setdefault(key, forged_class)
+            order_key = (weakref.ref(function), key)
+            self._order[order_key] = None
+            self._order.move_to_end(order_key)
+            self._evict()
+            return forged_class
+
+    def _evict(self):
+        while len(self._order) > self.maxsize:
+            (ref, key), _ = self._order.popitem(last=False)
+            # registered classes keep their function alive
+            function = ref()
+            entries = self._classes[function]
+            del entries[key]
+            if not entries:
+                del self._classes[function]
+
+    def resize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def info(self):
+        with self._lock:
+            return {
+                'maxsize': self.maxsize,
+                'currsize': len(self._order),
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+_dictionarize_registry = _DictionarizeRegistry(maxsize=256)
+
+def set_dictionarize_registry_size(maxsize):
+    '''
+    Set the maximum number of dictionarized classes kept for reuse
+
+    Args:
+        maxsize: (int) registry size. Set to 0 to forge a new class on every call.
+    '''
+    assert isinstance(maxsize, int) and maxsize >= 0, 'maxsize must be a non-negative integer'
+    _dictionarize_registry.resize(maxsize)
+
+def dictionarize_registry_info():
+    '''
+    Return the dictionarize registry statistics
+
+    Returns:
+        a dict with keys: maxsize, currsize, hits, misses
+    '''
+    return _dictionarize_registry.info()
+
+
+def _chunked(iterable, chunksize):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, chunksize))
+        if not chunk:
+            return
+        yield chunk
+
+def _dictionarized_map(obj, iterable, executor=None, chunksize=128):
+    '''
+    Implementation of the map() method of dictionarized classes
+
+    Args:
+        obj: a dictionarized instance
+        iterable: (iterable of tuple) the input arguments of each call
+        executor: (concurrent.futures.Executor or None) executor to run chunks in.
+            A ProcessPoolExecutor requires `obj` to be picklable.
+        chunksize: (int) number of calls per chunk
+
+    Returns:
+        a generator of the results, in order
+    '''
+    assert isinstance(chunksize, int) and chunksize > 0, 'chunksize must be a positive integer'
+
+    # the calls would return coroutine objects, which are never awaited
+    if inspect.iscoroutinefunction(type(obj).__call__):
+        raise TypeError('{} wraps a coroutine function, use amap() instead of map()'.format(
+                                                                        type(obj).__name__))
+
+    return _map_results(obj, iterable, executor, chunksize)
+
+def _map_results(obj, iterable, executor, chunksize):
+    # generator of _dictionarized_map, which checks its arguments when called
+    if executor is None:
+        for chunk in _chunked(iterable, chunksize):
+            yield from obj._map_chunk(chunk)
+        return
+
+    # keep a bounded number of chunks in flight, so that results can be
+    # streamed from an unbounded iterable
+    max_pending = 2 * (os.cpu_count() or 1)
+    pending = collections.deque()
+    try:
+        for chunk in _chunked(iterable, chunksize):
+            pending.append(executor.submit(obj._map_chunk, chunk))
+            if len(pending) >= max_pending:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+    finally:
+        # the consumer stopped early or a call raised
+        for future in pending:
+            future.cancel()
+
+
+async def _dictionarized_amap(obj, iterable, limit=64, executor=None):
+    '''
+    Implementation of the amap() method of dictionarized classes
+
+    Args:
+        obj: a dictionarized instance
+        iterable: (iterable of tuple) the input arguments of each call
+        limit: (int) maximum number of calls running concurrently
+        executor: (concurrent.futures.Executor or None) executor running the calls
+            if obj does not wrap a coroutine function
+
+    Returns:
+        an async generator of the results, in order
+    '''
+    # asyncio is only needed here, do not pay for it at import time
+    import asyncio
+
+    assert isinstance(limit, int) and limit > 0, 'limit must be a positive integer'
+
+    loop = asyncio.get_running_loop()
+
+    if inspect.iscoroutinefunction(type(obj).__call__):
+        def start(inputs):
+            return loop.create_task(obj(*inputs))
+    else:
+        def start(inputs):
+            return loop.run_in_executor(executor, functools.partial(obj, *inputs))
+
+    # keep at most `limit` calls in flight and yield the results in order
+    pending = collections.deque()
+    try:
+        for inputs in iterable:
+            if len(pending) >= limit:
+                yield await pending.popleft()
+            pending.append(start(inputs))
+
+        while pending:
+            yield await pending.popleft()
+    finally:
+        for future in pending:
+            future.cancel()
+
+def _rebuild_dictionarized(function, name, inputs, cache, values):
+    '''
+    Unpickle a dictionarized instance
+
+    The class is looked up in (or forged into) the dictionarize registry of the
+    current process, so the source is only compiled once per worker.
+    '''
+    forged_class = dictionarize(function, name, inputs, cache=cache)
+    obj = dict.__new__(forged_class)
+    dict.update(obj, values)
+    return obj
+
+
+def dictionarize(function, name: str=None, inputs: set=set(), cache=None):
+    '''
+    dictionarize
+
+    Args:
+        function: a function
+        name: (str or None) the name of generated class. If set to None, the following operations will be used:
+            function.__name__.replace('_', ' ').title().replace(' ', '')
+        inputs: (a list/tuple/set of int or str) the names or position indices of the arguments that must 
+            be passed at calling __call__
+
+        cache: (LRU, TTL or None) memoize the results of calls which do not override stored fields,
+            keyed on the stored fields and the input arguments. The cache is shared by the instances
+            of the class, see cache_info() and cache_clear() on the class. Calls with unhashable
+            arguments are not cached. Setting or deleting an item drops the results cached for the
+            previous content of the instance. A cache hit costs about a microsecond, so only cache
+            functions that are more expensive than that.
+
+    Classes are memoized on (function, name, inputs, cache): calling dictionarize again with the same
+    arguments returns the previously forged class, unless instrumentation was enabled or disabled in
+    between. See set_dictionarize_registry_size.
+
+    Instances can be pickled if `function` can be pickled, i.e. it is importable by its module path.
+    '''
+    # get function signature
+    info = _signature_info(function)
+    sign = info.signature
+
+    # check if inputs is an array
+    if inputs is None:
+        inputs = set()
+    elif not isinstance(inputs, (tuple, list, set)):
+        inputs = set(inputs)
+
+
+    # check if wach element in inputs is str
+    for i in inputs:
+        assert isinstance(i, str),'inputs must be a list of `str` object, {} were given'.format(type(i))
+
+    _input_params = set(inputs)
+
+    # prepare
+    func_name = function.__name__
+    class_name = name if name is not None else func_name.replace('_', ' ').title().replace(' ', '')
+
+    # return the class forged by a previous call, if any. Classes forged with and
+    # without instrumentation are kept apart, see enable_instrumentation
+    registry_key = (class_name, frozenset(_input_params), cache, _core._instrumentation_enabled)
+    forged_class = _dictionarize_registry.get(function, registry_key)
+    if forged_class is not None:
+        return forged_class
+
+    signature = info.text
+    return_annotation = ''
+    args_name = None
+    kwargs_name = None
+    param_list = []
+    kwargs_list = []
+    input_param_list = []
+    input_fields = []
+    param_fields = []
+    property_list = []
+    func_param_list = []
+    chunk_param_list = []
+    chunk_keyword_list = []
+    hoist_list = []
+    input_names = []
+    #unpack_args = ''
+    pop_args = ''
+    return_annotation = ''
+
+    # handle return annotation
+    if sign.return_annotation != inspect.Signature.empty:
+        return_annotation = '-> {!r}'.format(sign.return_annotation)
+    
+    # handle parameters
+    for idx, param in enumerate(info.parameters):
+
+        # input
+        if (param.name in _input_params) or (idx in _input_params):
+
+            # do not accept variable-length keyword arguments as input arguments
+            if param.kind == param.VAR_KEYWORD:
+                continue
+
+            input_fields.append('{!r}'.format(param.name))
+            input_param_list.append(str(param))
+            input_names.append(param.name)
+
+            if param.kind == param.KEYWORD_ONLY:
+                func_param_list.append('{0}={0}'.format(param.name))
+                chunk_keyword_list.append('{0}={0}'.format(param.name))
+            elif param.kind == param.VAR_POSITIONAL:
+                func_param_list.append(str(param))
+                chunk_param_list.append(str(param))
+            else:
+                func_param_list.append(param.name)
+                chunk_param_list.append(param.name)
+
+        # not input
+        else:
+            # __init__ signature
+            param_list.append(str(param))
+    
+            # variable-length positional argument
+            if param.kind == param.VAR_POSITIONAL:
+                param_fields.append('{!r}'.format(param.name))
+                # kw
+                kwargs_list.append('{0!r}: {0}'.format(param.name))
+                args_name = param.name
+
+                pop_args = '{0} = _.pop({0!r}, [])'.format(args_name)
+
+                property_list.append(_property_scode_template.format(property_name=param.name))
+
+                func_param_list.append(str(param))
+                chunk_param_list.append('*_f_{}'.format(param.name))
+                hoist_list.append(param.name)
+
+            # variable-length keyword argument
+            elif param.kind == param.VAR_KEYWORD:
+                # unpack kwargs
+                kwargs_list.append(str(param))
+                kwargs_name = param.name
+
+            # others
+            else:
+                param_fields.append('{!r}'.format(param.name))
+                # kw
+                kwargs_list.append('{0!r}: {0}'.format(param.name))
+                property_list.append(_property_scode_template.format(property_name=param.name))
+
+                if (param.kind == param.POSITIONAL_ONLY or
+                      (param.kind == param.POSITIONAL_OR_KEYWORD and param.default is param.empty)):
+                    func_param_list.append('_.pop({!r})'.format(param.name))
+                    chunk_param_list.append('_f_{}'.format(param.name))
+                else:
+                    chunk_keyword_list.append('{0}=_f_{0}'.format(param.name))
+                hoist_list.append(param.name)
+
+
+
+    if len(input_param_list) > 0:
+        # append empty str to add an extra ',' to the tail of ', '.join(input_param_list) 
+        input_param_list.append('')
+
+    if len(func_param_list) > 0:
+        # append empty str to add an extra ',' to the tail of ', '.join(input_param_list) 
+        func_param_list.append('')
+        
+    source_vars = {
+        'func_name': func_name,
+        'class_name': class_name,
+        'signature': signature,
+        'return_annotation': return_annotation,
+        'param_list': ', '.join(param_list),
+        'kwargs_list': ', '.join(kwargs_list),
+        'input_param_list': ', '.join(input_param_list),
+        'input_fields': ', '.join(input_fields),
+        'param_fields': ', '.join(param_fields),
+        'property_list': ''.join(property_list),
+        'num_fields': len(param_fields),
+        'pop_args': pop_args,
+        'return_annotation': return_annotation,
+        }
+
+    namespace = {func_name: function}
+
+    qualname = getattr(function, '__qualname__', func_name)
+    enter_code, call_template = _instrument('dictionarize', qualname, namespace)
+
+    # coroutine functions are wrapped by coroutine functions
+    if inspect.iscoroutinefunction(function):
+        source_vars['async_prefix'] = 'async '
+        await_prefix = 'await '
+    else:
+        source_vars['async_prefix'] = ''
+        await_prefix = ''
+
+    source_vars['instrument_enter_code'] = enter_code
+    source_vars['chunk_call'] = call_template.format(call='{}{}({})'.format(
+                                    await_prefix, func_name, ', '.join(chunk_param_list + chunk_keyword_list)))
+    # the fast path of __call__ reads the stored fields as _map_chunk does
+    fast_call = source_vars['chunk_call']
+
+    if cache is not None:
+        assert isinstance(cache, (LRU, TTL)), 'cache must be an LRU or TTL object'
+        namespace['_cache'] = cache._create()
+        namespace['_missing'] = _missing
+        source_vars['fast_return_code'] = _cached_fast_return_scode_template.format(
+            fast_call=fast_call, input_key=''.join('{}, '.format(n) for n in input_names) or '()')
+        source_vars['cache_methods'] = _cache_methods_scode_template
+        # results are cached by __call__
+        source_vars['chunk_fallback'] = 'True'
+    else:
+        source_vars['chunk_fallback'] = '_len(self) != {}'.format(len(param_fields))
+        source_vars['fast_return_code'] = _fast_return_scode_template.format(fast_call=fast_call)
+        source_vars['cache_methods'] = ''
+    source_vars['call'] = call_template.format(call='{}{}({}**_)'.format(
+                                    await_prefix, func_name, ', '.join(func_param_list)))
+    source_vars['hoist_code'] = '\n'.join(['            _f_{0} = self[{0!r}]'.format(field)
+                                                for field in hoist_list] or ['            pass'])
+    source_vars['fast_hoist_code'] = '\n'.join(['    ' + line for line in source_vars['hoist_code'].split('\n')])
+
+    namespace['_map'] = _dictionarized_map
+    namespace['_amap'] = _dictionarized_amap
+    namespace['_to_bytes'] = _pack_to_bytes
+    namespace['_from_bytes'] = _pack_from_bytes
+    namespace['_dict_from_fields_impl'] = _dict_from_fields
+    namespace['_rebuild'] = _rebuild_dictionarized
+    namespace['_forge_args_value'] = (function, class_name, tuple(sorted(_input_params)), cache)
+
+    forged_class = _forge_func(class_name, 
+                               _dictionarize_scode_template,
+                               source_vars,
+                               namespace,
+                               kind='dictionarize',
+                               qualname=qualname)
+
+    # another thread may have forged the same class meanwhile, use the registered one
+    return _dictionarize_registry.put(function, registry_key, forged_class)
+
+
+_pipeline_scode_template = '''\
+{async_prefix}def _pipeline({signature}):
+    {instrument_enter_code}
+{stage_code}
+    return {return_code}
+'''
+
+def _pipeline_stage_call(stage, index, sources, namespace):
+    '''
+    Render the call to the function of a dictionarized instance with its stored fields
+    bound as constants in `namespace`
+
+    Args:
+        stage: a dictionarized instance
+        index: (int) position of the stage in the pipeline
+        sources: (dict) input name to the expression of its value
+        namespace: (dict) namespace of the forged pipeline, updated in place
+    '''
+    function = type(stage)._forge_args[0]
+    info = _signature_info(function)
+    qualname = getattr(function, '__qualname__', function.__name__)
+
+    def constant(name, value):
+        const_name = '_pipeline_s{}_{}'.format(index, name)
+        namespace[const_name] = value
+        return const_name
+
+    args = []
+    for param in info.parameters:
+        if param.name in sources:
+            value = sources[param.name]
+        elif param.kind == param.VAR_KEYWORD:
+            # stored keys which are not parameters
+            extra = {k: v for k, v in stage.items() if k not in info.index}
+            if extra:
+                args.append('**' + constant(param.name, extra))
+            continue
+        elif param.name in stage:
+            value = constant(param.name, stage[param.name])
+        elif param.kind == param.VAR_POSITIONAL:
+            continue
+        elif param.default is not param.empty:
+            # pass the default explicitly, so that every parameter can be passed positionally
+            value = constant(param.name, param.default)
+        else:
+            raise ValueError('stage {} ({}) has no value for {!r}'.format(index, qualname, param.name))
+
+        if param.kind == param.VAR_POSITIONAL:
+            args.append('*' + value)
+        elif param.kind == param.KEYWORD_ONLY:
+            args.append('{}={}'.format(param.name, value))
+        else:
+            args.append(value)
+
+    function_name = '_pipeline_f{}'.format(index)
+    namespace[function_name] = function
+    await_prefix = 'await ' if inspect.iscoroutinefunction(function) else ''
+
+    return '{}{}({})'.format(await_prefix, function_name, ', '.join(args)), bool(await_prefix)
+
+def pipeline(*stages, wiring=None):
+    '''
+    Fuse dictionarized instances, called one after another, into a single forged function
+
+    The forged function calls the dictionarized functions directly: the stored fields of
+    each stage are bound as constants when the pipeline is created, so that no dict is
+    merged and no __call__ frame is entered per stage. Changing a stage afterwards does
+    not change the pipeline. Result caches of the stages are not used.
+
+    Args:
+        stages: dictionarized instances, called in order
+        wiring: (list of dict or None) for each stage, a dict mapping its input names to the
+            value they receive: the index (int) of a previous stage, whose return value is
+            passed, or the name (str) of an argument of the pipeline. Inputs missing from
+            the dict are arguments of the pipeline with the same name. If None, the first
+            input of each stage but the first receives the return value of the previous stage.
+
+    Returns:
+        a function of the pipeline arguments, in order of first use, returning the return
+        value of the last stage. It is a coroutine function if any stage function is.
+
+    Example
+
+    >>> def load(path, mode='r'): ...
+    >>> def parse(text, strict): ...
+    >>> Load = dictionarize(load, inputs=['path'])
+    >>> Parse = dictionarize(parse, inputs=['text'])
+    >>> run = forge.pipeline(Load(mode='rb'), Parse(strict=True))
+    >>> run('data.txt')   # parse(load('data.txt', 'rb'), True)
+    '''
+    if not stages:
+        raise ValueError('pipeline requires at least one stage')
+
+    for index, stage in enumerate(stages):
+        if not (isinstance(stage, dict) and hasattr(type(stage), '_forge_args')
+                    and hasattr(type(stage), '_input_fields')):
+            raise TypeError('stage {} is not a dictionarized instance: {!r}'.format(index, stage))
+
+    if wiring is None:
+        wiring = [{}] + [{type(stage)._input_fields[0]: index} if type(stage)._input_fields else {}
+                            for index, stage in enumerate(stages[1:])]
+    elif len(wiring) != len(stages):
+        raise ValueError('wiring must have one dict per stage, {} given for {} stages'.format(
+                                                                len(wiring), len(stages)))
+
+    namespace = {}
+    arguments = []
+    stage_code = []
+    is_coroutine = False
+
+    for index, (stage, stage_wiring) in enumerate(zip(stages, wiring)):
+        input_fields = type(stage)._input_fields
+        sources = {}
+
+        for name in input_fields:
+            source = stage_wiring.get(name, name)
+
+            if isinstance(source, int):
+                if not 0 <= source < index:
+                    raise ValueError('input {!r} of stage {} is wired to stage {}, which does not '
+                                     'run before it'.format(name, index, source))
+                sources[name] = '_pipeline_r{}'.format(source)
+            else:
+                if not source.isidentifier() or source.startswith('_pipeline_'):
+                    raise ValueError('invalid pipeline argument name: {!r}'.format(source))
+                if source not in arguments:
+                    arguments.append(source)
+                sources[name] = source
+
+        unknown = set(stage_wiring) - set(input_fields)
+        if unknown:
+            raise ValueError('stage {} has no input {}'.format(index, ', '.join(sorted(map(repr, unknown)))))
+
+        call, awaited = _pipeline_stage_call(stage, index, sources, namespace)
+        is_coroutine = is_coroutine or awaited
+        stage_code.append((index, call))
+
+    names = [type(stage)._forge_args[0].__name__ for stage in stages]
+    qualname = 'pipeline({})'.format('>'.join(names))
+    enter_code, call_template = _instrument('pipeline', qualname, namespace)
+
+    # the return value of the last stage is returned directly
+    _, last_call = stage_code.pop()
+
+    source_vars = {
+        'async_prefix': 'async ' if is_coroutine else '',
+        'signature': ', '.join(arguments),
+        'instrument_enter_code': enter_code,
+        'stage_code': '\n'.join('    _pipeline_r{} = {}'.format(index, call) for index, call in stage_code),
+        'return_code': call_template.format(call=last_call),
+    }
+
+    fused = _forge_func('_pipeline',
+                        _pipeline_scode_template,
+                        source_vars,
+                        namespace,
+                        kind='pipeline',
+                        qualname=qualname)
+
+    fused.__name__ = 'pipeline'
+    fused.__qualname__ = qualname
+    fused.stages = stages
+
+    return fused
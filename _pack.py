@@ -0,0 +1,1150 @@
+'''
+ParameterPack: pack the arguments of a function into an attribute.
+'''
+# --- built in ---
+import sys
+import inspect
+import weakref
+import threading
+import functools
+import contextvars
+
+from collections import OrderedDict
+
+# --- 3rd party ---
+
+# --- my module ---
+from . import _core
+from ._core import _forge_func
+from ._core import _instrument
+from ._core import _signature_info
+from ._serialize import _pack_to_bytes
+from ._serialize import _pack_from_bytes
+
+
+# (filename, lineno, method, key) -> number of missing lookups at that call site, in
+# LRU order. Dynamic keys would grow it without bound, so only the most recently seen
+# sites are kept: a site dropped from it is logged again on its next lookup.
+_missing_lookups = OrderedDict()
+_missing_lookups_maxsize = 1024
+_missing_lookups_lock = threading.Lock()
+
+def _warn_missing(method, key, verbose):
+    '''
+    Count a missing key lookup of ParameterPack and log it the first time its call site is seen
+
+    Args:
+        method: (str) '__getitem__' or '__getattr__'
+        key: the missing key or name
+        verbose: (bool) whether to log the stack of the call site
+    '''
+    # caller of __getitem__ or __getattr__
+    frame = sys._getframe(2)
+    site = (frame.f_code.co_filename, frame.f_lineno, method, key)
+
+    with _missing_lookups_lock:
+        count = _missing_lookups.get(site, 0)
+        _missing_lookups[site] = count + 1
+        if count:
+            _missing_lookups.move_to_end(site)
+        elif len(_missing_lookups) > _missing_lookups_maxsize:
+            _missing_lookups.popitem(last=False)
+
+    if count:
+        return
+
+    import logging
+
+    logging.getLogger('forge').warning(
+        'From %s:%d: unexisted %s (from forge.ParameterPack.%s): %r. Further lookups from this line '
+        'are counted, see forge.parameterpack_warnings()%s',
+        site[0], site[1], 'key' if method == '__getitem__' else 'name', method, key,
+        '' if verbose else '. For more traceback info, please set_parameterpack_warning_level(2)',
+        stack_info=verbose, stacklevel=3)
+
+def parameterpack_warnings():
+    '''
+    Return the missing key lookups counted at warning levels 1 and 2, for the 1024 most
+    recently seen call sites and keys
+
+    Returns:
+        a list of dicts with keys: filename, lineno, method, key, count, most frequent first
+    '''
+    with _missing_lookups_lock:
+        sites = list(_missing_lookups.items())
+
+    return [{'filename': filename, 'lineno': lineno, 'method': method, 'key': key, 'count': count}
+                for (filename, lineno, method, key), count in sorted(sites, key=lambda item: -item[1])]
+
+def reset_parameterpack_warnings():
+    '''
+    Forget the counted missing key lookups, the next lookup from each call site is logged again
+    '''
+    with _missing_lookups_lock:
+        _missing_lookups.clear()
+
+
+def _replace_lazy_wrapper(lazy_wrapper, forged, owner):
+    '''
+    Replace `lazy_wrapper` with `forged` on the class it is defined on
+
+    Args:
+        lazy_wrapper: (Function) wrapper returned by _lazy_wrapper
+        forged: (Function) forged wrapper
+        owner: the first argument of the call, i.e. `self` or `cls`
+    '''
+    name = lazy_wrapper.__name__
+    mro = owner.__mro__ if isinstance(owner, type) else type(owner).__mro__
+
+    for klass in mro:
+        attr = klass.__dict__.get(name)
+        if attr is lazy_wrapper:
+            setattr(klass, name, forged)
+        elif isinstance(attr, (staticmethod, classmethod)) and attr.__func__ is lazy_wrapper:
+            setattr(klass, name, type(attr)(forged))
+        else:
+            continue
+        return
+
+def _lazy_wrapper(method, forge):
+    '''
+    Defer forging a wrapper of `method` until it is called for the first time
+
+    Args:
+        method: (Function) function to wrap
+        forge: (Function) forge(method) returns the forged wrapper
+
+    Returns:
+        a wrapper which forges the actual wrapper on the first call. If the wrapper
+        is found on the class of the first argument, it is replaced with the forged
+        one, otherwise it keeps delegating to it.
+    '''
+    forged = None
+    lock = threading.Lock()
+
+    def _forge_once(args):
+        nonlocal forged
+        if forged is None:
+            with lock:
+                if forged is None:
+                    forged = forge(method)
+                    if args:
+                        _replace_lazy_wrapper(_parameterpack__lazy__, forged, args[0])
+        return forged
+
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def _parameterpack__lazy__(*args, **kwargs):
+            return await (forged or _forge_once(args))(*args, **kwargs)
+    else:
+        @functools.wraps(method)
+        def _parameterpack__lazy__(*args, **kwargs):
+            return (forged or _forge_once(args))(*args, **kwargs)
+
+    # share attributes with method, like the forged wrapper
+    # (! __wrapped__ will be eliminated)
+    _parameterpack__lazy__.__dict__ = method.__dict__
+
+    return _parameterpack__lazy__
+
+
+class _ContextualPack:
+    '''
+    Proxy to the parameter pack of the current call, set by ParameterPack.pack(contextual=True)
+    '''
+    __slots__ = ('_var', '_owner')
+
+    def __init__(self, var, owner):
+        self._var = var
+        self._owner = owner
+
+    def _get(self):
+        try:
+            return self._var.get()
+        except LookupError:
+            raise LookupError('no parameter pack outside of a call to {}'.format(self._owner)) from None
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+    def __getitem__(self, key):
+        return self._get()[key]
+
+    def __iter__(self):
+        return iter(self._get())
+
+    def __len__(self):
+        return len(self._get())
+
+    def __contains__(self, key):
+        return key in self._get()
+
+    def __eq__(self, other):
+        return self._get() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        try:
+            return repr(self._var.get())
+        except LookupError:
+            return '<parameter pack of {}: unset>'.format(self._owner)
+
+
+def set_parameterpack_warning_level(b):
+    '''
+    set warning level
+
+    ERROR: raise exception
+    WARNING: log a warning to the 'forge' logger
+    WARN-V: log a warning and the stack trace
+    IGNORE: ignore any exceptions
+
+    Warnings return None for the missing key. They are logged once per call site
+    and key, later lookups are only counted, see parameterpack_warnings().
+
+    Args:
+        b: (str or int)
+    '''
+    mapping = {'ERROR': 0, 'WARNING': 1, 'WARN-V': 2, 'IGNORE': 3,
+               'error': 0, 'warning': 1, 'warn-v': 2, 'ignore': 3,
+               'e': 0, 'w': 1, 'wv': 2, 'i': 3}
+
+    if isinstance(b, str):
+        assert b in mapping.keys()
+        level = mapping[b]
+    else:
+        assert isinstance(b, int)
+        level = b
+
+    # unknown levels behave like IGNORE
+    ParameterPack._warning_level = level
+    ParameterPack._install_accessors(level if level in (0, 1, 2) else 3)
+
+class ParameterPack(OrderedDict):
+    '''
+    ParameterPack
+
+    It's a kind of named tuple, but implemented using OrderedDict.
+    '''
+
+    _warning_level = 0
+
+    # === private member ===
+    _parameterpack_scode_template = '''\
+{async_prefix}def {name}({signature}):
+    {instrument_enter_code}
+{package_code}
+{setattr_package_code}
+{return_code}
+'''
+
+    _return_scode_template = '''\
+    return {call}
+'''
+
+    _contextual_return_scode_template = '''\
+    _token = _pack_var.set(_package)
+    try:
+        return {call}
+    finally:
+        _pack_var.reset(_token)
+'''
+
+    _package_scode_template = '''\
+    _arg_list = [{kwpair_list!s}]
+{unpack_kwargs_code}
+    # create OrderedDict, _pack_cls = ParameterPack
+    _package = _pack_cls(_arg_list)
+'''
+
+    _compact_package_scode_template = '''\
+    # create tuple, _pack_cls = forged CompactParameterPack
+    _package = _tuple_new(_pack_cls, ({value_list}))
+'''
+
+    _compact_class_scode_template = '''\
+from builtins import property as _property
+from operator import itemgetter as _itemgetter
+
+
+class {class_name}(_base):
+    \'\'\'Compact parameter pack of {method_name}{signature}\'\'\'
+
+    __slots__ = ()
+
+    _fields = ({fields})
+    _index = {{ {index} }}
+
+    # === properties ===
+
+{property_list}
+'''
+
+    _compact_property_scode_template = '''\
+    {property_name} = _property(_itemgetter({index}), doc='Alias for field number {index}')
+'''
+
+    _view_package_scode_template = '''\
+    # keep the arguments by reference, _pack_cls = forged ParameterPackView
+    _package = _pack_cls({args}, _pack_kwargs)
+'''
+
+    _view_class_scode_template = '''\
+from builtins import len as _len
+from builtins import property as _property
+
+
+class {class_name}(_base):
+    \'\'\'Parameter pack view of {method_name}{signature}\'\'\'
+
+    __slots__ = ()
+
+    _fields = ({fields})
+    _named = frozenset(({named}))
+    _unpack = {unpack}
+
+    # === getters ===
+
+{getter_list}
+    _getters = {{ {getter_map} }}
+
+    # === properties ===
+
+{property_list}
+'''
+
+    _view_positional_getter_scode_template = '''\
+    def _get_{index}(self):
+        _args = self._args
+        if _len(_args) > {position}:
+            return _args[{position}]
+        return {missing}
+
+'''
+
+    _view_getter_scode_template = '''\
+    def _get_{index}(self):
+        return {value}
+
+'''
+
+    _view_property_scode_template = '''\
+    {property_name} = _property(_get_{index}, doc='Alias for field {property_name}')
+'''
+
+    _unpack_kwargs_scode_template = '''\
+    _arg_list.extend({kwargs_name}.items())
+'''
+
+    _setattr_package_scode_template = '''\
+    setattr({target}, {property!r}, _package)
+'''
+
+    def __init__(self, *args, **kwargs):
+        super(ParameterPack, self).__init__(*args, **kwargs)
+        object.__setattr__(self, '__dict__', self)
+
+    def __iter__(self):
+        yield from self.values()
+
+    # === serialization ===
+
+    to_bytes = _pack_to_bytes
+    from_bytes = classmethod(_pack_from_bytes)
+
+    @classmethod
+    def _from_fields(cls, fields, values):
+        return cls(zip(fields, values))
+
+    # === level-specialized accessors ===
+    # At level 0 (the default) ParameterPack does not define __getitem__ nor __getattr__,
+    # so lookups cost the same as OrderedDict lookups. Other levels install the methods
+    # below, see set_parameterpack_warning_level.
+
+    def _getitem_warning(self, key):
+        try:
+            return OrderedDict.__getitem__(self, key)
+        except KeyError:
+            # log warning message and return None
+            _warn_missing('__getitem__', key, False)
+            return None
+
+    def _getitem_warning_verbose(self, key):
+        try:
+            return OrderedDict.__getitem__(self, key)
+        except KeyError:
+            # log warning message, stack traces and return None
+            _warn_missing('__getitem__', key, True)
+            return None
+
+    def _getitem_ignore(self, key):
+        return OrderedDict.get(self, key, None)
+
+    def _getattr_warning(self, name):
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            # log warning message and return None
+            _warn_missing('__getattr__', name, False)
+            return None
+
+    def _getattr_warning_verbose(self, name):
+        try:
+            return object.__getattribute__(self, name)
+        except AttributeError:
+            # log warning message, stack traces and return None
+            _warn_missing('__getattr__', name, True)
+            return None
+
+    def _getattr_ignore(self, name):
+        return OrderedDict.get(self, name, None)
+
+    # warning level -> (__getitem__, __getattr__), None means inherited from OrderedDict
+    _accessors = {
+        0: (None, None),
+        1: (_getitem_warning, _getattr_warning),
+        2: (_getitem_warning_verbose, _getattr_warning_verbose),
+        3: (_getitem_ignore, _getattr_ignore),
+    }
+
+    @classmethod
+    def _install_accessors(cls, level):
+        getitem, getattr_ = cls._accessors[level]
+
+        for attr, method in (('__getitem__', getitem), ('__getattr__', getattr_)):
+            if method is not None:
+                setattr(cls, attr, method)
+            elif attr in cls.__dict__:
+                delattr(cls, attr)
+
+    def __setattr__(self, name, value):
+        self.__setitem__(name, value)
+
+    def __delattr__(self, name):
+        self.__delitem__(name)
+
+    @classmethod
+    def pack(cls, name='args', target=0, unpack_kwargs=False, store_kwargs=True, ignore_first=True, ignore=[],
+                  compact=False, lazy=True, contextual=False, view=False, intern=False):
+        '''
+        Pack all function arguments (Ordered) and store them on self.[name] property
+
+        Args:
+            name: (str) property name
+            target: (None or int or str) the target object the parameter pack will be attached to
+                int -> position arg, where 0 commonly refers to `self` or `cls` (first positional arg) for class method
+                str -> arg name
+                None -> the parameter pack is attached on method
+            unpack_kwargs: (bool) whether to unpack the variable-length keyword arguments
+            store_kwargs: (bool) whether to store whole variable-length keyword arguments on self.[name].[kwargs]
+            ignore_first: (bool) whether to ignore the first variable. This is usually used to avoid storing `self` or `cls`
+            ignore: (a list of str) a list of variable names that should be ignored
+            compact: (bool) whether to store the arguments in a CompactParameterPack, an immutable tuple-based
+                pack class forged for the decorated signature. It is much lighter than the default OrderedDict
+                based pack, but it cannot be combined with `unpack_kwargs`.
+            lazy: (bool) whether to defer signature analysis and code generation until the first call. The forged
+                wrapper then replaces the decorated method on its class, so later calls go straight to it. Errors
+                in the arguments above, e.g. an unknown target, are raised on the first call.
+            contextual: (bool) only valid if `target` is None. Instead of storing the parameter pack on the method,
+                store it in a contextvars.ContextVar for the duration of the call. `method.[name]` then refers to the
+                pack of the current call in each thread and asyncio task, so the method can be called concurrently.
+            view: (bool) whether to store a ParameterPackView, which keeps the positional arguments and keyword
+                arguments of the call by reference and only resolves a field when it is read. Packing then costs
+                about as much as creating a small object. The view is read-only and cannot be combined with `compact`.
+                The forged wrapper takes (*args, **kwargs), so arguments are checked by the method itself.
+            intern: (bool) whether to store a FrozenParameterPack. Calls with equal arguments then share one
+                immutable pack, so repeated configurations cost a single pack and compare by identity. Values
+                of different types, e.g. 1 and 1.0, make different packs. Cannot be combined with `compact`
+                nor `view`.
+
+        Returns:
+            a wrapped function
+
+        
+
+        for example, we create a class as follows:
+        
+        >>> class MyClass():
+        ...
+        ...     @ParameterPack.pack(name='pack')   # name: property name on which the parameter pack is stored
+        ...     def __init__(self, x, y, z, name=None, **kwargs):
+        ...         pass
+
+        then, we construct an instance by calling it:
+
+        >>> my_class = MyClass(1, 2, 3, m=10, n=20)
+
+        The ParameterPack.pack will pack all of the arguments listed in __init__(...) and store them on my_class.pack,
+        which outputs the following contents if we print it out:
+
+        >>> print(my_class.pack)
+        ParameterPack([('x', 1), ('y', 2), ('z', 3), ('name', None), ('kwargs', {'m':10, 'n':20})])
+
+        Notice that if we set `unpack_kwargs` to True, then the kwargs as well as ('m', 10), ('n': 20) will all be stored 
+        in the ParameterPack. If we set `store_kwargs` to False, then the kwargs will not be stored. Set `ignore_first`
+        to True, the first argument (which, in this case, is `self`) will be ignored.
+
+        We can unpack them in the same order as defined in the function signature:
+
+        >>> x, y, z, name, kwargs = my_class.pack
+        >>> print('x={}/y={}/z={}/name={}/kwargs={}'.format(x, y, z, name, kwargs))
+        x=1/y=2/z=3/name=None/kwargs={'m':10, 'n':20}
+
+
+
+        example usage:
+
+        This function is very useful when your function/class accepts too many variables and you are lazy to assign them one by
+        one to your function/class. The following example shows a class funciton with a bunch of arguments that you must assign
+        them to `self` one by one without using this function:
+
+        >>> class MyClass():
+        ...     def __init__(self, a, b, c, d, e, f, g, h, i, j, k, l, m, n, o, p, q, r, s, t, u, v, w, x, y, z, **kwargs):
+        ...         self.a = a
+        ...         self.b = b
+        ...         self.c = c
+        ...         self.d = d
+        ...         # ... 6 MONTHS LATER ...
+        ...         self.z = z
+        ...         self.kwargs = kwargs
+        ...     def print_partial_args(self):
+        ...         # redundent `self`
+        ...         print(self.a, self.b, self.c, self.d, self.e, self.f, self.g)
+
+        With `ParameterPack.pack`, things will get easier:
+
+        >>> class MyClass():
+        ...     @ParameterPack.pack(name='args')
+        ...     def __init__(self, a, b, c, d, e, f, g, h, i, j, k, l, m, n, o, p, q, r, s, t, u, v, w, x, y, z, **kwargs):
+        ...         pass
+        ...     def print_partial_args(self):
+        ...         a, b, c, d, e, f, g, *_ = self.args
+        ...         print(a, b, c, d, e, f, g)
+
+        
+        '''
+
+
+
+        def _forge_wrapper(method):
+
+            target_object = target
+            
+            info = _signature_info(method)
+            kwpair_list = []
+            field_list = []
+            kwargs_name = None
+            need_unpack_kwargs = False
+            unpack_kwargs_code = ''
+            setattr_package_code = ''
+            
+            for idx, param in enumerate(info.parameters):
+                
+
+                # if target is int, get target name
+                if isinstance(target_object, int) and idx == target:
+                    target_object = param.name
+                
+                # ignore the first argument
+                if idx == 0 and ignore_first:
+                    continue
+
+                # ignore arguments listed in the ignore list
+                if param.name in ignore:
+                    continue
+
+                # handle **kwargs
+                if param.kind == param.VAR_KEYWORD:
+
+                    if store_kwargs:
+                        kwpair_list.append("('{0}', {0})".format(param.name, param.name))
+                        field_list.append(param.name)
+                    kwargs_name = param.name
+                    need_unpack_kwargs = unpack_kwargs
+
+                else:
+                    kwpair_list.append("('{0}', {0})".format(param.name, param.name))
+                    field_list.append(param.name)
+
+
+            if (not method.__name__[0].isalpha()) or method.__name__[0].isupper():
+                func_name = '_ParameterPack{}'.format(method.__name__)
+            else:
+                func_name = '_ParameterPack_{}'.format(method.__name__)
+
+
+            return_code = cls._return_scode_template
+
+            # if target is not None, the parameter pack is attached to the target object,
+            # otherwise, the parameter pack is attached to the method
+            if contextual:
+                if target_object is not None:
+                    raise RuntimeError('contextual mode requires target=None')
+
+                # installed by _wrapper
+                pack_var = getattr(method, name)._var
+                return_code = cls._contextual_return_scode_template
+
+            elif target_object is not None:
+                if (not isinstance(target_object, str)) or (target_object not in info.index):
+                    raise RuntimeError('Unknown target: {}'.format(target_object))
+
+                # generate code for setattr
+                setattr_package_code = cls._setattr_package_scode_template.format(target=target_object, property=name)
+            else:
+                setattr_package_code = cls._setattr_package_scode_template.format(target='_method', property=name)
+
+
+            if intern and (compact or view):
+                raise RuntimeError('intern mode does not support {}'.format('compact' if compact else 'view'))
+
+            if view:
+                if compact:
+                    raise RuntimeError('view mode does not support compact')
+
+                # the view does not keep the ignored first argument, which is usually the
+                # object the pack is attached to and would make a reference cycle
+                offset = int(ignore_first and bool(info.parameters) and info.parameters[0].kind in
+                                (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD))
+
+                # forge a view class for this signature
+                pack_class = ParameterPackView._forge(method, info, field_list, need_unpack_kwargs, offset)
+
+                package_code = cls._view_package_scode_template.format(
+                    args='_pack_args[{}:]'.format(offset) if offset else '_pack_args')
+
+                namespace = {'_pack_cls': pack_class}
+
+                # the target is read from the arguments
+                if target_object is not None and not contextual:
+                    setattr_package_code = cls._setattr_package_scode_template.format(
+                        target=ParameterPackView._target_scode(info, target_object),
+                        property=name)
+
+            elif compact:
+                if need_unpack_kwargs:
+                    raise RuntimeError('compact mode does not support unpack_kwargs')
+
+                # forge a pack class for this signature
+                pack_class = CompactParameterPack._forge(method, info.text, field_list)
+
+                package_code = cls._compact_package_scode_template.format(
+                    value_list=''.join('{}, '.format(field) for field in field_list))
+
+                namespace = {'_pack_cls': pack_class, '_tuple_new': tuple.__new__}
+
+            else:
+                # generate code for unpacking kwargs
+                if need_unpack_kwargs:
+                    unpack_kwargs_code = cls._unpack_kwargs_scode_template.format(kwargs_name=kwargs_name)
+
+                package_code = cls._package_scode_template.format(
+                    kwpair_list=', '.join(kwpair_list),
+                    unpack_kwargs_code=unpack_kwargs_code)
+
+                # interned packs are looked up by their items
+                namespace = {'_pack_cls': FrozenParameterPack._intern if intern else cls}
+
+            namespace['_method'] = method
+            if contextual:
+                namespace['_pack_var'] = pack_var
+
+            qualname = getattr(method, '__qualname__', method.__name__)
+            enter_code, call_template = _instrument('pack', qualname, namespace)
+
+            # coroutine functions are awaited, so that the call runs while the pack is set
+            is_coroutine = inspect.iscoroutinefunction(method)
+
+            if view:
+                signature = '*_pack_args, **_pack_kwargs'
+                call_args = '*_pack_args, **_pack_kwargs'
+            else:
+                namespace.update(info.defaults)
+                signature = info.scode
+                call_args = info.call_scode
+
+            # === forging function ===
+            source_vars = {
+                'name': func_name,
+                'signature': signature,
+                'instrument_enter_code': enter_code,
+                'package_code': package_code,
+                'setattr_package_code': setattr_package_code,
+                'return_code': return_code.format(call=call_template.format(call='{}_method({})'.format(
+                                    'await ' if is_coroutine else '', call_args))),
+                'async_prefix': 'async ' if is_coroutine else '',
+            }
+
+            wrapper_method = _forge_func(func_name, 
+                                         cls._parameterpack_scode_template, 
+                                         source_vars, 
+                                         namespace,
+                                         kind='pack',
+                                         qualname=qualname)
+
+            # assign attributes
+            # (! __wrapped__ will be eliminated)
+            functools.update_wrapper(wrapper_method, method)
+            wrapper_method.__dict__ = method.__dict__
+
+
+            return wrapper_method
+
+        def _wrapper(method):
+            # forge.aot records the code forged while importing modules
+            lazy_forge = lazy and _core._aot_recorder is None
+
+            if contextual:
+                # the method reads the pack of the current call through a proxy
+                pack_var = contextvars.ContextVar('{}.{}'.format(method.__qualname__, name))
+                setattr(method, name, _ContextualPack(pack_var, method.__qualname__))
+
+            if lazy_forge:
+                return _lazy_wrapper(method, _forge_wrapper)
+            return _forge_wrapper(method)
+
+        return _wrapper
+
+
+# (items) -> FrozenParameterPack, see FrozenParameterPack._intern
+_intern_table = weakref.WeakValueDictionary()
+_intern_lock = threading.Lock()
+
+_frozen_scalar_types = frozenset((int, float, complex, str, bytes, bool, type(None)))
+
+def _freeze(value):
+    '''
+    Return a hashable key of `value`, equal for values of the same type which compare equal
+    '''
+    cls = type(value)
+    if cls in _frozen_scalar_types:
+        return (cls, value)
+    if cls is dict:
+        return (cls, frozenset((k, _freeze(v)) for k, v in value.items()))
+    if cls in (list, tuple):
+        return (cls, tuple(_freeze(v) for v in value))
+    if cls in (set, frozenset):
+        return (cls, frozenset(_freeze(v) for v in value))
+    if isinstance(value, OrderedDict):
+        return (cls, tuple((k, _freeze(v)) for k, v in value.items()))
+    # other objects are keyed by their own hash, which raises TypeError if unhashable
+    return (cls, value)
+
+
+class FrozenParameterPack(ParameterPack):
+    '''
+    FrozenParameterPack
+
+    An immutable ParameterPack created by ParameterPack.pack(intern=True). Packs with equal
+    contents are interned: while a pack is alive, packing equal arguments returns the very
+    same pack, so an interned pack equals another one only if it is the same object. Packs
+    with unhashable contents are frozen but not interned, they compare like ParameterPack
+    and cannot be hashed. Values are not copied: mutating a mutable value, e.g. the dict
+    of variable-length keyword arguments, changes it for every owner of the pack.
+    '''
+
+    __slots__ = ('_intern_key',)
+
+    @classmethod
+    def _intern(cls, items):
+        '''
+        Return the interned pack of `items`, a list of (field, value)
+        '''
+        scalar_types = _frozen_scalar_types
+
+        try:
+            key = tuple([(field, (type(value), value) if type(value) in scalar_types else _freeze(value))
+                            for field, value in items])
+            pack = _intern_table.get(key)
+        except TypeError:
+            # unhashable contents
+            return cls._frozen(items, None)
+
+        if pack is None:
+            with _intern_lock:
+                # another thread may have interned the same contents meanwhile
+                pack = _intern_table.get(key)
+                if pack is None:
+                    pack = _intern_table[key] = cls._frozen(items, key)
+        return pack
+
+    @classmethod
+    def _frozen(cls, items, key):
+        pack = OrderedDict.__new__(cls)
+        object.__setattr__(pack, '__dict__', pack)
+        object.__setattr__(pack, '_intern_key', key)
+        for field, value in items:
+            OrderedDict.__setitem__(pack, field, value)
+        return pack
+
+    def __init__(self, *args, **kwargs):
+        raise TypeError('FrozenParameterPack is created by ParameterPack.pack(intern=True)')
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError('FrozenParameterPack is immutable')
+
+    __setitem__ = __delitem__ = __setattr__ = __delattr__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = move_to_end = _immutable
+
+    def __hash__(self):
+        if self._intern_key is None:
+            raise TypeError('FrozenParameterPack with unhashable contents')
+        return hash(self._intern_key)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if (isinstance(other, FrozenParameterPack) and self._intern_key is not None
+                and other._intern_key is not None):
+            # equal interned packs are the same object
+            return False
+        return OrderedDict.__eq__(self, other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        # interned again on unpickling
+        return (FrozenParameterPack._intern, (list(self.items()),))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+    @classmethod
+    def _from_fields(cls, fields, values):
+        return cls._intern(list(zip(fields, values)))
+
+
+class CompactParameterPack(tuple):
+    '''
+    CompactParameterPack
+
+    A tuple-based, immutable parameter pack created by ParameterPack.pack(compact=True).
+    A subclass is forged for each decorated signature, which stores the field names
+    on the class, so every instance is as light as a plain tuple. Values can be
+    unpacked in order and read by attribute, by name or by position.
+    '''
+
+    __slots__ = ()
+
+    _fields = ()
+    _index = {}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                key = self._index[key]
+            except KeyError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, ', '.join(
+                    '{}={!r}'.format(f, v) for f, v in zip(self._fields, self)) )
+
+    def get(self, key, default=None):
+        index = self._index.get(key)
+        if index is None:
+            return default
+        return tuple.__getitem__(self, index)
+
+    def keys(self):
+        return self._fields
+
+    def values(self):
+        return tuple(self)
+
+    def items(self):
+        return tuple(zip(self._fields, self))
+
+    def _asdict(self):
+        '''
+        Return a new ParameterPack which maps field names to their values
+        '''
+        return ParameterPack(zip(self._fields, self))
+
+    to_bytes = _pack_to_bytes
+    from_bytes = classmethod(_pack_from_bytes)
+
+    @classmethod
+    def _from_fields(cls, fields, values):
+        if fields != cls._fields:
+            raise ValueError('fields {} do not match {}'.format(fields, cls.__qualname__))
+        return tuple.__new__(cls, values)
+
+    def __reduce__(self):
+        if type(self)._pack_key is None:
+            return tuple.__reduce_ex__(self, 2)
+        # the class is forged again by _rebuild_compact_pack if needed
+        return (_rebuild_compact_pack, (type(self)._pack_key, tuple(self)))
+
+    # (module, qualname, signature, fields) of the decorated method, set on forged classes
+    _pack_key = None
+
+    @classmethod
+    def _forge(cls, method, signature, fields):
+        '''
+        Forge a pack class for the signature of `method`
+
+        Args:
+            method: (Function) the decorated function
+            signature: (str) signature of `method`
+            fields: (list of str) field names, in order
+        '''
+        return cls._forge_key((method.__module__, method.__qualname__, signature, tuple(fields)))
+
+    @classmethod
+    def _forge_key(cls, key):
+        '''
+        Return the pack class of `key`, a (module, qualname, signature, fields) of the
+        decorated method, forging it if no class of the same key is alive
+        '''
+        pack_class = _compact_classes.get(key)
+        if pack_class is not None:
+            return pack_class
+
+        module, qualname, signature, fields = key
+        method_name = qualname.rpartition('.')[2]
+
+        property_list = []
+        for idx, field in enumerate(fields):
+            # fields must not shadow the pack interface, use pack[field] instead
+            if hasattr(cls, field):
+                continue
+            property_list.append(ParameterPack._compact_property_scode_template.format(
+                                                    property_name=field, index=idx))
+
+        source_vars = {
+            'class_name': cls.__name__,
+            'method_name': method_name,
+            'signature': signature,
+            'fields': ''.join('{!r}, '.format(field) for field in fields),
+            'index': ', '.join('{!r}: {}'.format(field, idx) for idx, field in enumerate(fields)),
+            'property_list': ''.join(property_list),
+        }
+
+        pack_class = _forge_func(cls.__name__,
+                                 ParameterPack._compact_class_scode_template,
+                                 source_vars,
+                                 {'_base': cls})
+
+        pack_class.__qualname__ = '{}[{}]'.format(cls.__name__, qualname)
+        pack_class.__module__ = module
+        pack_class._pack_key = key
+
+        # another thread may have forged the same class meanwhile
+        return _compact_classes.setdefault(key, pack_class)
+
+
+# (module, qualname, signature, fields) -> forged CompactParameterPack class
+_compact_classes = weakref.WeakValueDictionary()
+
+def _rebuild_compact_pack(key, values):
+    '''
+    Unpickle a CompactParameterPack
+
+    Forged classes cannot be looked up by name, so the class is the live class of the
+    same decorated method, or is forged again from its fields.
+    '''
+    return tuple.__new__(CompactParameterPack._forge_key(key), values)
+
+
+class ParameterPackView:
+    '''
+    ParameterPackView
+
+    A read-only parameter pack created by ParameterPack.pack(view=True). It keeps the
+    positional arguments (but the ignored first one) and the keyword argument dict of
+    the call by reference, and resolves a field from them only when it is read. A subclass is forged for each
+    decorated signature. Values can be unpacked in order and read by attribute or by name.
+    A view is pickled as the ParameterPack of its fields.
+    '''
+
+    __slots__ = ('_args', '_kwargs')
+
+    _fields = ()
+    _named = frozenset()
+    _unpack = False
+    _getters = {}
+
+    def __init__(self, args, kwargs):
+        self._args = args
+        self._kwargs = kwargs
+
+    def __getitem__(self, key):
+        getter = self._getters.get(key)
+        if getter is not None:
+            return getter(self)
+        if self._unpack and key not in self._named and key in self._kwargs:
+            return self._kwargs[key]
+        raise KeyError(key)
+
+    def _extra_keys(self):
+        # unpacked variable-length keyword arguments
+        return tuple(k for k in self._kwargs if k not in self._named and k not in self._getters)
+
+    def __getattr__(self, name):
+        # only reached for unpacked variable-length keyword arguments
+        if self._unpack and name not in ParameterPackView.__slots__:
+            try:
+                return self[name]
+            except KeyError:
+                pass
+        raise AttributeError('{!r} object has no attribute {!r}'.format(self.__class__.__name__, name))
+
+    def __contains__(self, key):
+        return key in self._getters or (self._unpack and key in self._extra_keys())
+
+    def __iter__(self):
+        for key in self.keys():
+            yield self[key]
+
+    def __len__(self):
+        return len(self.keys())
+
+    def __repr__(self):
+        return '{}({})'.format(self.__class__.__name__, ', '.join(
+                    '{}={!r}'.format(f, v) for f, v in self.items()) )
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        if self._unpack:
+            return self._fields + self._extra_keys()
+        return self._fields
+
+    def values(self):
+        return tuple(self)
+
+    def items(self):
+        return tuple((key, self[key]) for key in self.keys())
+
+    def _asdict(self):
+        '''
+        Return a new ParameterPack which maps field names to their values
+        '''
+        return ParameterPack(self.items())
+
+    def __reduce__(self):
+        # forged view classes cannot be looked up by name, pickle the resolved fields
+        return (ParameterPack, (list(self.items()),))
+
+    def __copy__(self):
+        return type(self)(self._args, self._kwargs)
+
+    def __deepcopy__(self, memo):
+        import copy
+
+        return type(self)(copy.deepcopy(self._args, memo), copy.deepcopy(self._kwargs, memo))
+
+    to_bytes = _pack_to_bytes
+
+    @staticmethod
+    def _target_scode(info, name):
+        '''
+        Render the expression reading the argument `name` in a wrapper of (*_pack_args, **_pack_kwargs)
+
+        Args:
+            info: (_SignatureInfo) signature of the decorated function
+            name: (str) parameter name
+        '''
+        # positional parameters come first
+        position = info.index[name]
+        param = info.parameters[position]
+
+        if param.kind == param.POSITIONAL_ONLY:
+            return '_pack_args[{}]'.format(position)
+        elif param.kind == param.POSITIONAL_OR_KEYWORD:
+            return '(_pack_args[{0}] if len(_pack_args) > {0} else _pack_kwargs[{1!r}])'.format(position, name)
+        return '_pack_kwargs[{!r}]'.format(name)
+
+    @classmethod
+    def _forge(cls, method, info, fields, unpack, offset=0):
+        '''
+        Forge a view class for the signature of `method`
+
+        Args:
+            method: (Function) the decorated function
+            info: (_SignatureInfo) signature of `method`
+            fields: (list of str) field names, in order
+            unpack: (bool) whether the variable-length keyword arguments are fields
+            offset: (int) number of leading positional arguments not kept in the view
+        '''
+        namespace = {'_base': cls}
+        getter_list = []
+        property_list = []
+        named = []
+        position = -offset
+
+        for param in info.parameters:
+            if param.kind in (param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY):
+                named.append(param.name)
+
+            if param.name in fields:
+                index = fields.index(param.name)
+
+                if param.default is not param.empty:
+                    default_name = '_forge_default_{}'.format(param.name)
+                    namespace[default_name] = param.default
+                    from_kwargs = 'self._kwargs.get({!r}, {})'.format(param.name, default_name)
+                else:
+                    default_name = None
+                    from_kwargs = 'self._kwargs[{!r}]'.format(param.name)
+
+                if param.kind == param.POSITIONAL_ONLY:
+                    getter_list.append(ParameterPack._view_positional_getter_scode_template.format(
+                        index=index, position=position,
+                        missing=default_name or '_args[{}]'.format(position)))
+                elif param.kind == param.POSITIONAL_OR_KEYWORD:
+                    getter_list.append(ParameterPack._view_positional_getter_scode_template.format(
+                        index=index, position=position, missing=from_kwargs))
+                elif param.kind == param.VAR_POSITIONAL:
+                    getter_list.append(ParameterPack._view_getter_scode_template.format(
+                        index=index, value='self._args[{}:]'.format(position)))
+                elif param.kind == param.KEYWORD_ONLY:
+                    getter_list.append(ParameterPack._view_getter_scode_template.format(
+                        index=index, value=from_kwargs))
+                else:
+                    getter_list.append(ParameterPack._view_getter_scode_template.format(
+                        index=index, value='{k: v for k, v in self._kwargs.items() if k not in self._named}'))
+
+                # fields must not shadow the pack interface, use pack[field] instead
+                if not hasattr(cls, param.name):
+                    property_list.append(ParameterPack._view_property_scode_template.format(
+                                                        property_name=param.name, index=index))
+
+            if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+                position += 1
+
+        source_vars = {
+            'class_name': cls.__name__,
+            'method_name': method.__name__,
+            'signature': info.text,
+            'fields': ''.join('{!r}, '.format(field) for field in fields),
+            'named': ''.join('{!r}, '.format(name) for name in named),
+            'unpack': bool(unpack),
+            'getter_list': ''.join(getter_list),
+            'getter_map': ', '.join('{!r}: _get_{}'.format(field, idx) for idx, field in enumerate(fields)),
+            'property_list': ''.join(property_list),
+        }
+
+        pack_class = _forge_func(cls.__name__,
+                                 ParameterPack._view_class_scode_template,
+                                 source_vars,
+                                 namespace)
+
+        pack_class.__qualname__ = '{}[{}]'.format(cls.__name__, method.__qualname__)
+        pack_class.__module__ = method.__module__
+
+        return pack_class
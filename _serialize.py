@@ -0,0 +1,382 @@
+'''
+Binary serialization of packs and dictionarized instances.
+'''
+# --- built in ---
+import struct
+import functools
+
+# --- 3rd party ---
+
+# --- my module ---
+
+
+# === serialization ===
+#
+# pack     := MAGIC VERSION u32 length schema values
+# stream   := MAGIC VERSION (b'S' u32 length schema | b'R' u32 length values)*
+# schema   := u16 count (u16 length utf-8 name)*
+# values   := (tag payload)*, one per field
+#
+# Integers are little-endian. Values are tagged with one byte; values of other
+# types than the ones below are pickled, and only unpickled with allow_pickle=True
+# since unpickling can run arbitrary code. Truncated data raises ValueError.
+
+_serial_magic = b'FRGP'
+_serial_version = 1
+
+_u16 = struct.Struct('<H')
+_u32 = struct.Struct('<I')
+_i64 = struct.Struct('<q')
+_f64 = struct.Struct('<d')
+
+_truncated = 'truncated FRGP data'
+
+def _encode_value(value, out):
+    encoder = _value_encoders.get(type(value))
+    if encoder is None:
+        # pickle is only needed for other types, do not pay for it at import time
+        import pickle
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        out += b'P'
+        out += _u32.pack(len(data))
+        out += data
+    else:
+        encoder(value, out)
+
+def _encode_int(value, out):
+    if -0x8000000000000000 <= value <= 0x7fffffffffffffff:
+        out += b'i'
+        out += _i64.pack(value)
+    else:
+        data = value.to_bytes((value.bit_length() + 8) // 8, 'little', signed=True)
+        out += b'I'
+        out += _u32.pack(len(data))
+        out += data
+
+def _encode_str(value, out):
+    data = value.encode('utf-8')
+    out += b's'
+    out += _u32.pack(len(data))
+    out += data
+
+def _encode_bytes(value, out):
+    out += b'b'
+    out += _u32.pack(len(value))
+    out += value
+
+def _encode_sequence(tag):
+    def _encode(value, out):
+        out += tag
+        out += _u32.pack(len(value))
+        for item in value:
+            _encode_value(item, out)
+    return _encode
+
+def _encode_dict(value, out):
+    out += b'm'
+    out += _u32.pack(len(value))
+    for key, item in value.items():
+        _encode_value(key, out)
+        _encode_value(item, out)
+
+_value_encoders = {
+    type(None): lambda value, out: out.extend(b'N'),
+    bool: lambda value, out: out.extend(b'T' if value else b'F'),
+    int: _encode_int,
+    float: lambda value, out: out.extend(b'd' + _f64.pack(value)),
+    str: _encode_str,
+    bytes: _encode_bytes,
+    tuple: _encode_sequence(b't'),
+    list: _encode_sequence(b'l'),
+    dict: _encode_dict,
+}
+
+def _decode_value(buf, offset, zero_copy, allow_pickle):
+    '''
+    Decode the value at buf[offset:]
+
+    Returns:
+        (value, offset of the next value)
+    '''
+    tag = buf[offset]
+    offset += 1
+
+    if tag == 0x69:     # i
+        return _i64.unpack_from(buf, offset)[0], offset + 8
+    elif tag == 0x73:   # s
+        size, = _u32.unpack_from(buf, offset)
+        offset += 4
+        if offset + size > len(buf):
+            raise ValueError(_truncated)
+        return str(buf[offset:offset+size], 'utf-8'), offset + size
+    elif tag == 0x64:   # d
+        return _f64.unpack_from(buf, offset)[0], offset + 8
+    elif tag == 0x4e:   # N
+        return None, offset
+    elif tag == 0x54:   # T
+        return True, offset
+    elif tag == 0x46:   # F
+        return False, offset
+    elif tag == 0x62:   # b
+        size, = _u32.unpack_from(buf, offset)
+        offset += 4
+        if offset + size > len(buf):
+            raise ValueError(_truncated)
+        value = buf[offset:offset+size]
+        return (value if zero_copy else bytes(value)), offset + size
+    elif tag in (0x74, 0x6c):   # t, l
+        size, = _u32.unpack_from(buf, offset)
+        offset += 4
+        items = []
+        for _ in range(size):
+            item, offset = _decode_value(buf, offset, zero_copy, allow_pickle)
+            items.append(item)
+        return (tuple(items) if tag == 0x74 else items), offset
+    elif tag == 0x6d:   # m
+        size, = _u32.unpack_from(buf, offset)
+        offset += 4
+        value = {}
+        for _ in range(size):
+            key, offset = _decode_value(buf, offset, zero_copy, allow_pickle)
+            value[key], offset = _decode_value(buf, offset, zero_copy, allow_pickle)
+        return value, offset
+    elif tag == 0x49:   # I
+        size, = _u32.unpack_from(buf, offset)
+        offset += 4
+        if offset + size > len(buf):
+            raise ValueError(_truncated)
+        return int.from_bytes(buf[offset:offset+size], 'little', signed=True), offset + size
+    elif tag == 0x50:   # P
+        if not allow_pickle:
+            raise ValueError('the data contains a pickled value, which can run arbitrary code when '
+                             'loaded: pass allow_pickle=True if the data comes from a trusted source')
+        import pickle
+        size, = _u32.unpack_from(buf, offset)
+        offset += 4
+        if offset + size > len(buf):
+            raise ValueError(_truncated)
+        return pickle.loads(buf[offset:offset+size]), offset + size
+
+    raise ValueError('invalid value tag: {!r}'.format(chr(tag)))
+
+@functools.lru_cache(maxsize=1024)
+def _encode_schema(fields):
+    out = bytearray(_u16.pack(len(fields)))
+    for field in fields:
+        data = field.encode('utf-8')
+        out += _u16.pack(len(data))
+        out += data
+    return bytes(out)
+
+def _decode_schema(buf, offset):
+    '''
+    Returns:
+        (tuple of field names, offset of the values)
+    '''
+    count, = _u16.unpack_from(buf, offset)
+    offset += 2
+    fields = []
+    for _ in range(count):
+        size, = _u16.unpack_from(buf, offset)
+        offset += 2
+        if offset + size > len(buf):
+            raise ValueError(_truncated)
+        fields.append(str(buf[offset:offset+size], 'utf-8'))
+        offset += size
+    return tuple(fields), offset
+
+@functools.lru_cache(maxsize=1024)
+def _decode_schema_bytes(schema):
+    try:
+        return _decode_schema(schema, 0)[0]
+    except struct.error:
+        raise ValueError(_truncated) from None
+
+def _encode_values(values, out):
+    # the common types are inlined, see _encode_value
+    pack_i64 = _i64.pack
+    for value in values:
+        value_type = type(value)
+        if value_type is int and -0x8000000000000000 <= value <= 0x7fffffffffffffff:
+            out += b'i'
+            out += pack_i64(value)
+        elif value_type is str:
+            data = value.encode('utf-8')
+            out += b's'
+            out += _u32.pack(len(data))
+            out += data
+        elif value_type is float:
+            out += b'd'
+            out += _f64.pack(value)
+        elif value is None:
+            out += b'N'
+        else:
+            _encode_value(value, out)
+
+def _decode_values(buf, offset, count, zero_copy, allow_pickle):
+    # the common types are inlined, see _decode_value
+    unpack_i64 = _i64.unpack_from
+    unpack_u32 = _u32.unpack_from
+    end = len(buf)
+    values = []
+    append = values.append
+    for _ in range(count):
+        tag = buf[offset]
+        if tag == 0x69:     # i
+            append(unpack_i64(buf, offset + 1)[0])
+            offset += 9
+        elif tag == 0x73:   # s
+            size, = unpack_u32(buf, offset + 1)
+            offset += 5
+            if offset + size > end:
+                raise ValueError(_truncated)
+            append(str(buf[offset:offset+size], 'utf-8'))
+            offset += size
+        elif tag == 0x64:   # d
+            append(_f64.unpack_from(buf, offset + 1)[0])
+            offset += 9
+        elif tag == 0x4e:   # N
+            append(None)
+            offset += 1
+        else:
+            value, offset = _decode_value(buf, offset, zero_copy, allow_pickle)
+            append(value)
+    return values
+
+def _decode_fields(cls, fields, buf, offset, zero_copy, allow_pickle):
+    '''
+    Decode the values of `fields` at buf[offset:] into an instance of cls
+    '''
+    try:
+        values = _decode_values(buf, offset, len(fields), zero_copy, allow_pickle)
+    except (struct.error, IndexError):
+        # a tag or a fixed-size value past the end of buf
+        raise ValueError(_truncated) from None
+    return cls._from_fields(fields, values)
+
+def _pack_to_bytes(pack):
+    '''
+    Implementation of the to_bytes() method of packs and dictionarized instances
+    '''
+    schema = _encode_schema(tuple(pack.keys()))
+    out = bytearray(_serial_magic)
+    out.append(_serial_version)
+    out += _u32.pack(len(schema))
+    out += schema
+    _encode_values(pack.values(), out)
+    return bytes(out)
+
+def _check_header(buf):
+    if len(buf) < 5:
+        raise ValueError(_truncated)
+    if bytes(buf[:4]) != _serial_magic:
+        raise ValueError('not a forge pack')
+    if buf[4] != _serial_version:
+        raise ValueError('unsupported forge pack version: {}'.format(buf[4]))
+    return 5
+
+def _pack_from_bytes(cls, data, zero_copy=False, allow_pickle=False):
+    '''
+    Implementation of the from_bytes() class method of packs and dictionarized classes
+
+    Args:
+        data: (bytes-like object) data returned by to_bytes()
+        zero_copy: (bool) whether to return bytes fields as memoryview slices of `data`
+            instead of copying them
+        allow_pickle: (bool) whether to unpickle the values of types without a tag, which
+            can run arbitrary code. If False, ValueError is raised on such values.
+
+    Raises ValueError if `data` is truncated or is not a forge pack.
+    '''
+    buf = memoryview(data)
+    offset = _check_header(buf)
+    if offset + 4 > len(buf):
+        raise ValueError(_truncated)
+    size, = _u32.unpack_from(buf, offset)
+    offset += 4
+    if offset + size > len(buf):
+        raise ValueError(_truncated)
+    fields = _decode_schema_bytes(bytes(buf[offset:offset+size]))
+    offset += size
+    return _decode_fields(cls, fields, buf, offset, zero_copy, allow_pickle)
+
+def _dict_from_fields(cls, fields, values):
+    obj = dict.__new__(cls)
+    dict.update(obj, zip(fields, values))
+    return obj
+
+def dump_many(packs, file):
+    '''
+    Write packs to a binary file object. The field names are written once for
+    each run of packs with the same fields.
+
+    Args:
+        packs: (iterable) ParameterPack, CompactParameterPack, ParameterPackView or
+            dictionarized instances
+        file: a binary file object
+
+    Returns:
+        the number of packs written
+    '''
+    file.write(_serial_magic + bytes((_serial_version,)))
+
+    fields = None
+    count = 0
+    out = bytearray()
+
+    for pack in packs:
+        pack_fields = tuple(pack.keys())
+        if pack_fields != fields:
+            fields = pack_fields
+            schema = _encode_schema(fields)
+            file.write(b'S' + _u32.pack(len(schema)) + schema)
+
+        del out[:]
+        _encode_values(pack.values(), out)
+        file.write(b'R' + _u32.pack(len(out)))
+        file.write(out)
+        count += 1
+
+    return count
+
+def load_many(file, cls=None, zero_copy=False, allow_pickle=False):
+    '''
+    Read the packs written by dump_many
+
+    Args:
+        file: a binary file object
+        cls: the class of the packs to create: ParameterPack (if None), a class forged
+            for CompactParameterPack or a dictionarized class
+        zero_copy: (bool) whether to return bytes fields as memoryview slices instead
+            of copying them
+        allow_pickle: (bool) whether to unpickle the values of types without a tag, which
+            can run arbitrary code. If False, ValueError is raised on such values.
+
+    Returns:
+        a generator of packs, which raises ValueError on truncated or invalid data
+    '''
+    if cls is None:
+        from ._pack import ParameterPack
+        cls = ParameterPack
+
+    _check_header(file.read(5))
+
+    fields = None
+    while True:
+        header = file.read(5)
+        if not header:
+            return
+        if len(header) != 5:
+            raise ValueError(_truncated)
+
+        size, = _u32.unpack_from(header, 1)
+        buf = memoryview(file.read(size))
+        if len(buf) != size:
+            raise ValueError(_truncated)
+
+        if header[0] == 0x53:   # S
+            fields = _decode_schema_bytes(bytes(buf))
+        elif header[0] == 0x52 and fields is not None:   # R
+            yield _decode_fields(cls, fields, buf, 0, zero_copy, allow_pickle)
+        else:
+            raise ValueError('invalid forge pack stream')
@@ -0,0 +1,150 @@
+'''
+Ahead-of-time forging
+
+Import modules, record the code forged while importing them and write it to a
+Python module:
+
+    python -m forge.aot myapp.models [myapp.views ...] -o myapp/_forged.py
+
+Every forged class or function becomes a factory function in the generated
+module, whose parameters are the names the code refers to. Register the
+generated module before importing the modules it was generated from:
+
+    import forge
+    forge.use_aot('myapp._forged', strict=True)
+
+    import myapp.models
+
+Forging then calls the factories instead of compiling code at runtime. With
+strict=True, forging code that was not generated raises RuntimeError.
+
+Only code forged at import time is recorded: ParameterPack.pack wrappers are
+forged eagerly while recording, argshandler serve() wrappers are always forged
+when decorating, and dictionarize is recorded if it is called at module level.
+Regenerate the module after changing the decorated functions or upgrading forge.
+'''
+# --- built in ---
+import sys
+import argparse
+import keyword
+import textwrap
+import importlib
+
+# --- 3rd party ---
+
+# --- my module ---
+from . import _core
+
+
+_module_header = '''\
+\'\'\'
+Forged code of {modules}
+
+Generated by `python -m forge.aot`, do not edit.
+\'\'\'
+
+'''
+
+_factory_template = '''\
+# {kind}: {qualname}
+def {factory_name}({parameters}):
+{source}
+    return {name}
+
+'''
+
+_forged_template = '''\
+FORGED = {{
+{entries}}}
+'''
+
+
+def record(modules):
+    '''
+    Import modules and record the code forged while importing them
+
+    Args:
+        modules: (list of str) module names
+
+    Returns:
+        a list of (kind, qualname, name, source, namespace names)
+    '''
+    records = []
+    _core._aot_recorder = records
+    try:
+        for module in modules:
+            importlib.import_module(module)
+    finally:
+        _core._aot_recorder = None
+
+    return records
+
+
+def _identifier(text):
+    return ''.join(c if c.isalnum() else '_' for c in text).strip('_')
+
+
+def render(records, modules=()):
+    '''
+    Render the recorded code as a Python module
+
+    Args:
+        records: (list) the records returned by record()
+        modules: (list of str) module names, for the header
+
+    Returns:
+        the source code of the module
+    '''
+    factories = []
+    entries = []
+    seen = set()
+
+    for kind, qualname, name, source, names in records:
+        key = _core._aot_key(source)
+        if key in seen:
+            continue
+        seen.add(key)
+
+        for n in names:
+            if not n.isidentifier() or keyword.iskeyword(n):
+                raise ValueError('cannot generate {} {}: {!r} is not an identifier'.format(kind, qualname, n))
+
+        factory_name = '_{}_{}_{}'.format(kind, _identifier(qualname), key[:8])
+
+        factories.append(_factory_template.format(
+            kind=kind,
+            qualname=qualname,
+            factory_name=factory_name,
+            parameters='*, ' + ', '.join(sorted(names)) if names else '',
+            source=textwrap.indent(source, '    '),
+            name=name))
+
+        entries.append('    {!r}: {},\n'.format(key, factory_name))
+
+    return (_module_header.format(modules=', '.join(modules) or 'no module')
+            + ''.join(factories)
+            + _forged_template.format(entries=''.join(entries)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m forge.aot',
+                                     description='Generate forged code ahead of time')
+    parser.add_argument('modules', nargs='+', help='modules to import')
+    parser.add_argument('-o', '--output', default=None, help='output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    records = record(args.modules)
+    source = render(records, args.modules)
+
+    if args.output is None:
+        sys.stdout.write(source)
+    else:
+        with open(args.output, 'w') as f:
+            f.write(source)
+
+        print('{} forged objects written to {}'.format(source.count('\ndef '), args.output),
+              file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+'''
+Benchmarks for forge
+
+Measures the cost of forged code compared with hand-written equivalents:
+forge time per API, per-call overhead of each wrapper, instance memory
+footprint, the import time of forge, the binary pack serialization, fused
+pipelines of dictionarized stages, forging from many threads at once and
+the ahead-of-time forging round trip.
+Signatures range from 1 to 50 parameters, with and without *args/**kwargs.
+
+Usage (from the parent directory of forge):
+
+    python -m forge.benchmarks run -o results.json
+    python -m forge.benchmarks run --quick --only call_overhead memory
+    python -m forge.benchmarks compare base.json results.json
+    python -m forge.benchmarks budget
+    python -m forge.benchmarks aot
+    python -m forge.benchmarks cycles
+'''
+# --- built in ---
+import json
+import importlib
+
+# --- 3rd party ---
+
+# --- my module ---
+from . import _common
+
+
+__all__ = [
+    'BENCHMARKS',
+    'run',
+    'compare',
+]
+
+BENCHMARKS = (
+    'forge_time',
+    'call_overhead',
+    'memory',
+    'import_time',
+    'compact_pack',
+    'warning_level',
+    'argshandler_serve',
+    'serialization',
+    'pack_batch',
+    'pipeline',
+    'concurrent_forge',
+    'aot_roundtrip',
+)
+
+
+def run(names=None, quick=False, log=None):
+    '''
+    Run benchmarks
+
+    Args:
+        names: (list of str or None) benchmarks to run, default to BENCHMARKS
+        quick: (bool) measure fewer cases with fewer repeats
+        log: (Function or None) called with the name of each benchmark before it runs
+
+    Returns:
+        a dict with keys: meta (environment info), results (list of result records)
+    '''
+    results = []
+    for name in (names or BENCHMARKS):
+        if name not in BENCHMARKS:
+            raise ValueError('Unknown benchmark: {}'.format(name))
+        if log is not None:
+            log(name)
+        module = importlib.import_module('.' + name, __name__)
+        results.extend(module.run(quick=quick))
+
+    return {'meta': _common.metadata(), 'results': results}
+
+def _key(result):
+    return (result['benchmark'], result['variant'],
+            json.dumps(result.get('params', {}), sort_keys=True))
+
+def compare(base, new, threshold=0.1):
+    '''
+    Compare two benchmark reports
+
+    Args:
+        base: (dict) report returned by run(), e.g. from the previous commit
+        new: (dict) report returned by run()
+        threshold: (float) relative change regarded as a regression
+
+    Returns:
+        a list of dicts with keys: benchmark, variant, params, unit, base, new, change, regression.
+        `change` is new/base - 1 for measurements present in both reports.
+    '''
+    base_results = {_key(r): r for r in base['results']}
+
+    rows = []
+    for result in new['results']:
+        base_result = base_results.get(_key(result))
+        if base_result is None or not base_result['value']:
+            continue
+
+        change = result['value'] / base_result['value'] - 1
+        # units like 'calls/s' are higher-is-better
+        if result['unit'].endswith('/s'):
+            regression = change < -threshold
+        else:
+            regression = change > threshold
+
+        rows.append({
+            'benchmark': result['benchmark'],
+            'variant': result['variant'],
+            'params': result.get('params', {}),
+            'unit': result['unit'],
+            'base': base_result['value'],
+            'new': result['value'],
+            'change': change,
+            'regression': regression,
+        })
+    return rows
@@ -0,0 +1,117 @@
+# --- built in ---
+import sys
+import json
+import argparse
+
+# --- 3rd party ---
+
+# --- my module ---
+from . import BENCHMARKS
+from . import run
+from . import compare
+
+
+def _run(args):
+    report = run(args.only, quick=args.quick,
+                 log=lambda name: print('running {}...'.format(name), file=sys.stderr))
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+def _compare(args):
+    with open(args.base) as f:
+        base = json.load(f)
+    with open(args.new) as f:
+        new = json.load(f)
+
+    rows = compare(base, new, threshold=args.threshold)
+
+    regressions = 0
+    for row in rows:
+        params = ' '.join('{}={}'.format(k, v) for k, v in sorted(row['params'].items()))
+        flag = 'REGRESSION' if row['regression'] else ''
+        print('{:<32} {:<22} {:<28} {:>12.1f} -> {:>12.1f} {:<15} {:>+7.1%} {}'.format(
+                row['benchmark'], row['variant'], params, row['base'], row['new'],
+                row['unit'], row['change'], flag).rstrip())
+        regressions += row['regression']
+
+    print('{} measurements compared, {} regressions'.format(len(rows), regressions))
+    return 1 if regressions else 0
+
+def _budget(args):
+    from .import_time import check
+
+    exceeded = 0
+    for row in check(quick=args.quick):
+        flag = 'EXCEEDED' if row['exceeded'] else ''
+        print('{:<36} {:>8} us / {:>8} us {}'.format(row['statement'], row['time'], row['budget'], flag).rstrip())
+        exceeded += row['exceeded']
+
+    print('{} budgets exceeded'.format(exceeded))
+    return 1 if exceeded else 0
+
+def _aot(args):
+    from .aot_roundtrip import check
+
+    failed = 0
+    for row in check():
+        status = 'FAILED: {}'.format(row['error']) if row['error'] else 'ok'
+        print('{:<16} {:>4} generated {}'.format(row['kind'], row['generated'] or 0, status))
+        failed += row['error'] is not None
+
+    print('{} apis failed the round trip'.format(failed))
+    return 1 if failed else 0
+
+def _cycles(args):
+    from .memory import check
+
+    leaked = 0
+    for row in check():
+        print('{:<16} {}'.format(row['mode'], 'ok' if row['freed'] else 'NOT FREED by refcount'))
+        leaked += not row['freed']
+
+    print('{} pack modes make reference cycles'.format(leaked))
+    return 1 if leaked else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m forge.benchmarks',
+                                     description='Benchmarks for forge')
+    subparsers = parser.add_subparsers(dest='command')
+
+    run_parser = subparsers.add_parser('run', help='run benchmarks and print or save the JSON report')
+    run_parser.add_argument('--only', nargs='+', choices=BENCHMARKS, help='benchmarks to run')
+    run_parser.add_argument('--quick', action='store_true', help='measure fewer cases with fewer repeats')
+    run_parser.add_argument('-o', '--output', help='write the JSON report to this file')
+    run_parser.set_defaults(func=_run)
+
+    compare_parser = subparsers.add_parser('compare', help='compare two JSON reports')
+    compare_parser.add_argument('base', help='report of the baseline')
+    compare_parser.add_argument('new', help='report to compare against the baseline')
+    compare_parser.add_argument('--threshold', type=float, default=0.1,
+                                help='relative change regarded as a regression (default: 0.1)')
+    compare_parser.set_defaults(func=_compare)
+
+    budget_parser = subparsers.add_parser('budget', help='check the import time budgets of import_time.BUDGETS')
+    budget_parser.add_argument('--quick', action='store_true', help='use fewer interpreters')
+    budget_parser.set_defaults(func=_budget)
+
+    aot_parser = subparsers.add_parser('aot', help='check the forge.aot round trip of every forging api')
+    aot_parser.set_defaults(func=_aot)
+
+    cycles_parser = subparsers.add_parser('cycles', help='check that pack instances are freed by refcount')
+    cycles_parser.set_defaults(func=_cycles)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
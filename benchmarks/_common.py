@@ -0,0 +1,79 @@
+'''
+Helpers shared by the benchmark modules
+'''
+# --- built in ---
+import os
+import sys
+import time
+import timeit
+import platform
+import subprocess
+
+# --- 3rd party ---
+
+# --- my module ---
+
+
+def record(benchmark, variant, value, unit, **params):
+    '''
+    Create a result record
+
+    Args:
+        benchmark: (str) benchmark name, e.g. 'call_overhead.dictionarize'
+        variant: (str) what was measured, e.g. 'forged' or 'handwritten'
+        value: (float) measured value
+        unit: (str) unit of `value`. Units ending with '/s' are higher-is-better,
+            the others are lower-is-better.
+        params: extra parameters that identify the measurement, e.g. nparams=10
+    '''
+    return {
+        'benchmark': benchmark,
+        'variant': variant,
+        'params': params,
+        'value': value,
+        'unit': unit,
+    }
+
+def ns_per_call(stmt, number, repeat=5, namespace=None):
+    '''
+    Return the best time of `repeat` runs of `number` executions of `stmt`, in ns
+    per execution. `stmt` is a callable or a statement evaluated in `namespace`.
+    '''
+    seconds = min(timeit.repeat(stmt, number=number, repeat=repeat, globals=namespace))
+    return seconds / number * 1e9
+
+def best_of(func, repeat=5):
+    '''
+    Return the best wall time of `repeat` calls to func, in seconds
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def package_root():
+    '''
+    Return the directory of the forge package
+    '''
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def metadata():
+    '''
+    Describe the environment the benchmarks ran in
+    '''
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=package_root(),
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'python': sys.version,
+        'implementation': sys.implementation.name,
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
@@ -0,0 +1,64 @@
+'''
+Signatures used by the benchmarks, with 1 to 50 parameters and with or
+without *args/**kwargs, and generators for their hand-written equivalents.
+'''
+# --- built in ---
+
+# --- 3rd party ---
+
+# --- my module ---
+
+
+SIZES = (1, 5, 10, 25, 50)
+QUICK_SIZES = (1, 10, 50)
+
+# variant name -> (has *args, has **kwargs)
+VARIANTS = {
+    'plain': (False, False),
+    'args': (True, False),
+    'kwargs': (False, True),
+    'args_kwargs': (True, True),
+}
+
+
+def names(n):
+    return ['p{}'.format(i) for i in range(n)]
+
+def param_list(params, star_args, star_kwargs, first=None):
+    params = ([first] if first else []) + list(params)
+    if star_args:
+        params.append('*args')
+    if star_kwargs:
+        params.append('**kwargs')
+    return ', '.join(params)
+
+def call_list(values, star_args, star_kwargs, args='args', kwargs='kwargs'):
+    values = list(values)
+    if star_args:
+        values.append('*' + args)
+    if star_kwargs:
+        values.append('**' + kwargs)
+    return ', '.join(values)
+
+def build(source, name, namespace=None):
+    '''
+    Execute `source` and return the object called `name`
+    '''
+    namespace = dict(namespace or {})
+    exec(source, namespace)
+    return namespace[name]
+
+def make_function(n, star_args, star_kwargs, first=None, name='target'):
+    '''
+    Create a new function that takes `n` parameters and returns None
+    '''
+    source = 'def {}({}):\n    return None\n'.format(name, param_list(names(n), star_args, star_kwargs, first))
+    return build(source, name)
+
+def cases(quick=False):
+    '''
+    Yield (nparams, variant, star_args, star_kwargs)
+    '''
+    for n in (QUICK_SIZES if quick else SIZES):
+        for variant, (star_args, star_kwargs) in VARIANTS.items():
+            yield n, variant, star_args, star_kwargs
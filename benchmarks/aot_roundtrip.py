@@ -0,0 +1,164 @@
+'''
+Ahead-of-time forging round trip: generate the forged code of a module that uses
+every forging API with `python -m forge.aot`, then import the module in a fresh
+interpreter with use_aot(..., strict=True) and check the results of the forged
+code. `python -m forge.benchmarks aot` fails if the round trip breaks, the
+benchmark reports the import time of the module with and without the generated code.
+'''
+# --- built in ---
+import os
+import sys
+import json
+import tempfile
+import textwrap
+import subprocess
+
+# --- 3rd party ---
+
+# --- my module ---
+import forge
+from . import _common
+
+
+# module decorating functions with each API at import time, check() raises
+# AssertionError on a wrong result
+_module_scode = '''\
+from {forge} import dictionarize
+from {forge} import ParameterPack
+from {forge} import argshandler
+
+
+def add(a, b, *args, c=3, **kwargs):
+    return a + b + sum(args) + c + sum(kwargs.values())
+
+Add = dictionarize(add, inputs=['a'])
+
+
+class Packed:
+    @ParameterPack.pack(lazy=False)
+    def __init__(self, a, b=2, *args, c, **kwargs):
+        pass
+
+class Compact:
+    @ParameterPack.pack(lazy=False, compact=True)
+    def __init__(self, a, b=2, *, c):
+        pass
+
+class View:
+    @ParameterPack.pack(lazy=False, view=True)
+    def __init__(self, a, b=2, *args, c, **kwargs):
+        pass
+
+
+Handler = argshandler(sig='self, b')
+
+@Handler.serve(callback=None)
+def served(self, a, b, *args, c=3):
+    return a + b + sum(args) + c
+
+
+def check():
+    assert Add(2, 4, c=5, d=6)(1) == 1 + 2 + 4 + 5 + 6
+    assert Add(2).to_bytes() == type(Add(2)).from_bytes(Add(2).to_bytes()).to_bytes()
+
+    assert dict(Packed(1, 2, 3, c=4, d=5).args) == {{'a': 1, 'b': 2, 'args': (3,), 'c': 4, 'kwargs': {{'d': 5}}}}
+    assert tuple(Compact(1, c=4).args) == (1, 2, 4)
+    assert dict(View(1, 2, 3, c=4, d=5).args) == {{'a': 1, 'b': 2, 'args': (3,), 'c': 4, 'kwargs': {{'d': 5}}}}
+
+    assert Handler(None, 2).served(1, 3, c=4) == 1 + 2 + 3 + 4
+'''
+
+# the apis whose code must be generated, by forge.aot record kind
+_kinds = ('dictionarize', 'pack', 'serve')
+
+
+def _python(args, cwd):
+    # run a fresh interpreter that imports forge and the modules of cwd
+    env = dict(os.environ)
+    parent = os.path.dirname(os.path.dirname(os.path.abspath(forge.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [cwd, parent, env.get('PYTHONPATH')]))
+
+    return subprocess.run([sys.executable] + args, cwd=cwd, env=env,
+                          capture_output=True, text=True, check=True)
+
+def _python_code(code, cwd):
+    return _python(['-c', textwrap.dedent(code)], cwd)
+
+def roundtrip(directory):
+    '''
+    Generate the forged code of the test module into `directory` and import the
+    module from it in strict mode
+
+    Returns:
+        a list of dicts with keys: kind, generated (number of forged objects)
+    '''
+    with open(os.path.join(directory, 'forge_aot_module.py'), 'w') as f:
+        f.write(_module_scode.format(forge=forge.__name__))
+
+    _python(['-m', forge.__name__ + '.aot', 'forge_aot_module', '-o', 'forge_aot_forged.py'], directory)
+
+    # each factory is preceded by a `# kind: qualname` comment
+    with open(os.path.join(directory, 'forge_aot_forged.py')) as f:
+        kinds = [line[2:].split(':')[0] for line in f if line.startswith('# ')]
+
+    # raises CalledProcessError if the generated code is missing or wrong
+    _python_code('''
+        import {forge}
+        {forge}.use_aot('forge_aot_forged', strict=True)
+        import forge_aot_module
+        forge_aot_module.check()
+        '''.format(forge=forge.__name__), directory)
+
+    return [{'kind': kind, 'generated': kinds.count(kind)} for kind in _kinds]
+
+def check():
+    '''
+    Run the round trip in a temporary directory
+
+    Returns:
+        a list of dicts with keys: kind, generated, error (str or None)
+    '''
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            rows = roundtrip(directory)
+        except subprocess.CalledProcessError as e:
+            error = (e.stderr or str(e)).strip().splitlines()[-1]
+            return [{'kind': kind, 'generated': None, 'error': error} for kind in _kinds]
+
+    for row in rows:
+        row['error'] = None if row['generated'] else 'no code generated'
+    return rows
+
+def _import_time(directory, aot):
+    code = '''
+        import time
+        import {forge}
+        {forge}.{enable}
+        start = time.perf_counter()
+        import forge_aot_module
+        print(time.perf_counter() - start)
+        '''.format(forge=forge.__name__,
+                   enable="use_aot('forge_aot_forged', strict=True)" if aot else 'disable_forge_cache()')
+    return float(_python_code(code, directory).stdout)
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) use fewer interpreters
+
+    Returns:
+        a list of result records
+    '''
+    repeat = 3 if quick else 10
+
+    with tempfile.TemporaryDirectory() as directory:
+        roundtrip(directory)
+        return [_common.record('aot_roundtrip.import', variant,
+                               min(_import_time(directory, aot) for _ in range(repeat)) * 1e6, 'us')
+                    for variant, aot in (('runtime', False), ('aot', True))]
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,86 @@
+'''
+Throughput of argshandler serve() wrappers compared with the former
+inspect.BoundArguments based implementation.
+'''
+# --- built in ---
+import json
+import inspect
+from collections import OrderedDict
+
+# --- 3rd party ---
+
+# --- my module ---
+from forge import argshandler
+from . import _common
+
+
+class Handler(argshandler(sig='self, b, c')):
+    pass
+
+def _callback(handler, returns, *args, **kwargs):
+    return returns
+
+class Target():
+    @Handler.serve()
+    def func(self, a, b, *args, c, d=None, **kwargs):
+        return a
+
+    @Handler.serve(callback=_callback)
+    def func_callback(self, a, b, *args, c, d=None, **kwargs):
+        return a
+
+
+def _legacy_serve(func, callback):
+    '''
+    Hand-written equivalent of the wrappers previously forged by serve()
+    '''
+    func_sig = inspect.signature(func)
+
+    def _gened_func(_argshandler_self, a, *args, d=None, **kwargs):
+        default_params = _argshandler_self._argshandler_bound_args.arguments
+        params = OrderedDict([('a', a), ('args', args), ('d', d), ('kwargs', kwargs)])
+        default_params.update(params)
+
+        boundargs = inspect.BoundArguments(func_sig, default_params)
+
+        args = boundargs.args
+        kwargs = boundargs.kwargs
+
+        returns = func(*args, **kwargs)
+
+        if callback is None:
+            return _argshandler_self
+        return callback(_argshandler_self, returns, *args, **kwargs)
+
+    return _gened_func
+
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) use fewer calls per measurement
+
+    Returns:
+        a list of result records
+    '''
+    number = 20000 if quick else 200000
+    handler = Handler(Target(), 'b', 'c')
+
+    variants = [
+        ('forged', 'self', Handler.func),
+        ('legacy', 'self', _legacy_serve(Handler.func.func, None)),
+        ('forged', 'callback', Handler.func_callback),
+        ('legacy', 'callback', _legacy_serve(Handler.func_callback.func, _callback)),
+    ]
+
+    results = []
+    for variant, mode, wrapper in variants:
+        ns = _common.ns_per_call(lambda: wrapper(handler, 'a', 1, 2, d='d', foo='bar'), number, repeat=3)
+        results.append(_common.record('argshandler_serve.' + mode, variant, 1e9 / ns, 'calls/s'))
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
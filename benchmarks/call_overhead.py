@@ -0,0 +1,125 @@
+'''
+Per-call cost of the wrappers forged by dictionarize, ParameterPack.pack and
+argshandler(...).serve, compared with hand-written equivalents.
+'''
+# --- built in ---
+import json
+
+# --- 3rd party ---
+
+# --- my module ---
+from forge import dictionarize
+from forge import ParameterPack
+from forge import argshandler
+from . import _common
+from . import _signatures
+
+
+_handwritten_dictionarize_template = '''\
+class Handwritten():
+    __slots__ = ({slots})
+
+    def __init__(self, {init_params}):
+{assignments}
+
+    def __call__(self, p0):
+        return target({call_values})
+'''
+
+_handwritten_pack_template = '''\
+class Handwritten():
+    def __init__(self, {init_params}):
+{assignments}
+'''
+
+_handwritten_serve_template = '''\
+def func(handler, {wrapper_params}):
+    return target({call_values})
+'''
+
+
+def _dictionarize_case(n, star_args, star_kwargs):
+    target = _signatures.make_function(n, star_args, star_kwargs)
+    stored = _signatures.names(n)[1:]
+    fields = stored + (['args'] if star_args else []) + (['kwargs'] if star_kwargs else [])
+
+    forged = dictionarize(target, inputs=['p0'])(*range(1, n))
+
+    source = _handwritten_dictionarize_template.format(
+        slots=''.join('{!r}, '.format(f) for f in fields),
+        init_params=_signatures.param_list(stored, star_args, star_kwargs),
+        assignments='\n'.join('        self.{0} = {0}'.format(f) for f in fields) or '        pass',
+        call_values=_signatures.call_list(['p0'] + ['self.' + f for f in stored],
+                                          star_args, star_kwargs, 'self.args', 'self.kwargs'))
+    handwritten = _signatures.build(source, 'Handwritten', {'target': target})(*range(1, n))
+
+    return (lambda: forged(0)), (lambda: handwritten(0))
+
+def _pack_case(n, star_args, star_kwargs):
+    init_params = _signatures.param_list(_signatures.names(n), star_args, star_kwargs)
+
+    Forged = type('Forged', (), {
+        '__init__': ParameterPack.pack()(_signatures.make_function(n, star_args, star_kwargs, first='self'))
+    })
+
+    fields = _signatures.names(n) + (['args'] if star_args else []) + (['kwargs'] if star_kwargs else [])
+    source = _handwritten_pack_template.format(
+        init_params=init_params,
+        assignments='\n'.join('        self.{0} = {0}'.format(f) for f in fields))
+    Handwritten = _signatures.build(source, 'Handwritten')
+
+    values = tuple(range(n))
+    return (lambda: Forged(*values)), (lambda: Handwritten(*values))
+
+def _serve_case(n, star_args, star_kwargs):
+    # serve the first half of the parameters
+    served = _signatures.names(n)[:n//2]
+    passed = _signatures.names(n)[n//2:]
+
+    target = _signatures.make_function(n, star_args, star_kwargs, first='self')
+    Handler = argshandler(sig=', '.join(['self'] + served))
+    Handler.serve()(target)
+    handler = Handler(None, *range(len(served)))
+
+    source = _handwritten_serve_template.format(
+        wrapper_params=_signatures.param_list(passed, star_args, star_kwargs),
+        call_values=_signatures.call_list(['handler.self'] + ['handler.' + f for f in served] + passed,
+                                          star_args, star_kwargs))
+    func = _signatures.build(source, 'func', {'target': target})
+    plain = type('Plain', (), dict({'self': None}, **{f: i for i, f in enumerate(served)}))()
+
+    values = tuple(range(len(passed)))
+    return (lambda: handler.target(*values)), (lambda: func(plain, *values))
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) measure fewer signatures with fewer calls
+
+    Returns:
+        a list of result records
+    '''
+    number = 20000 if quick else 100000
+    repeat = 3 if quick else 5
+
+    apis = [
+        ('dictionarize', _dictionarize_case),
+        ('pack', _pack_case),
+        ('serve', _serve_case),
+    ]
+
+    results = []
+    for n, variant, star_args, star_kwargs in _signatures.cases(quick):
+        for api, make_case in apis:
+            forged, handwritten = make_case(n, star_args, star_kwargs)
+            for name, call in (('forged', forged), ('handwritten', handwritten)):
+                results.append(_common.record('call_overhead.' + api, name,
+                                              _common.ns_per_call(call, number, repeat),
+                                              'ns/call', nparams=n, signature=variant))
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,82 @@
+'''
+Memory footprint and construction time of ParameterPack.pack(compact=True),
+ParameterPack.pack(view=True) and ParameterPack.pack(intern=True) compared with
+the default OrderedDict-based pack. Every instance is built with the same
+arguments, which interned packs share.
+'''
+# --- built in ---
+import json
+
+# --- 3rd party ---
+
+# --- my module ---
+from forge import ParameterPack
+from . import _common
+from .memory import bytes_per_instance
+
+
+class Default():
+    @ParameterPack.pack(name='args')
+    def __init__(self, a, b, c, d=4, e=5, f=6):
+        pass
+
+class Compact():
+    @ParameterPack.pack(name='args', compact=True)
+    def __init__(self, a, b, c, d=4, e=5, f=6):
+        pass
+
+class View():
+    @ParameterPack.pack(name='args', view=True)
+    def __init__(self, a, b, c, d=4, e=5, f=6):
+        pass
+
+class Interned():
+    @ParameterPack.pack(name='args', intern=True)
+    def __init__(self, a, b, c, d=4, e=5, f=6):
+        pass
+
+class Plain():
+    def __init__(self, a, b, c, d=4, e=5, f=6):
+        pass
+
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) use fewer instances and constructions
+
+    Returns:
+        a list of result records
+    '''
+    count = 10000 if quick else 100000
+    number = 20000 if quick else 200000
+
+    results = []
+    for cls in (Plain, Default, Compact, View, Interned):
+        variant = cls.__name__.lower()
+        results.append(_common.record('compact_pack.construct', variant,
+                                      _common.ns_per_call(lambda: cls(1, 2, 3), number, repeat=3),
+                                      'ns/call'))
+        results.append(_common.record('compact_pack.memory', variant,
+                                      bytes_per_instance(lambda: cls(1, 2, 3), count),
+                                      'bytes/instance'))
+
+    # construct then read a single field, the common use of a view
+    for cls in (Default, Compact, View, Interned):
+        results.append(_common.record('compact_pack.construct_read_one', cls.__name__.lower(),
+                                      _common.ns_per_call(lambda: cls(1, 2, 3).args.e, number, repeat=3),
+                                      'ns/call'))
+
+    # compare the packs of two objects built with the same arguments
+    for cls in (Default, Compact, Interned):
+        x, y = cls(1, 2, 3).args, cls(1, 2, 3).args
+        results.append(_common.record('compact_pack.equal', cls.__name__.lower(),
+                                      _common.ns_per_call(lambda: x == y, number * 5, repeat=3),
+                                      'ns/call'))
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,112 @@
+'''
+Stress test of forging from many threads at once: every thread decorates
+functions with the same signatures, released together by a barrier. Fails if
+any forged function is wrong, and reports how many sources were compiled.
+'''
+# --- built in ---
+import json
+import time
+import threading
+
+# --- 3rd party ---
+
+# --- my module ---
+from forge import dictionarize
+from forge import ParameterPack
+from forge import argshandler
+from forge import _core
+from . import _common
+from . import _signatures
+
+
+def _make_echo(n, star_args, star_kwargs, first=None):
+    # a new function returning the values of its first n parameters
+    names = _signatures.names(n)
+    source = 'def target({}):\n    return ({})\n'.format(
+        _signatures.param_list(names, star_args, star_kwargs, first), ''.join(name + ', ' for name in names))
+    return _signatures.build(source, 'target')
+
+def _forge_all(shapes, check):
+    # decorate new functions of each shape with each API and call the results
+    handler = argshandler(sig='self')
+
+    for n, star_args, star_kwargs in shapes:
+        names = _signatures.names(n)
+        values = tuple(range(n))
+
+        forged = dictionarize(_make_echo(n, star_args, star_kwargs), inputs=['p0'])(*values[1:])
+        check(forged(0) == values)
+
+        method = _make_echo(n, star_args, star_kwargs, first='self')
+        obj = type('Obj', (), {})()
+        ParameterPack.pack(lazy=False)(method)(obj, *values)
+        check(tuple(obj.args[name] for name in names) == values)
+
+        handler.serve()(method)
+        check(handler(None).target(*values) is not None)
+
+def _stress(nthreads, shapes):
+    '''
+    Forge `shapes` from `nthreads` threads at once
+
+    Returns:
+        (wall time in seconds, number of forges, code cache counters)
+    '''
+    barrier = threading.Barrier(nthreads)
+    errors = []
+
+    def check(ok):
+        if not ok:
+            raise AssertionError('wrong result')
+
+    def worker():
+        barrier.wait()
+        try:
+            _forge_all(shapes, check)
+        except Exception as e:
+            errors.append(e)
+
+    _core._code_cache.clear()
+    before = _core._code_cache.info()
+
+    threads = [threading.Thread(target=worker) for _ in range(nthreads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+
+    if errors:
+        raise RuntimeError('{} of {} threads failed to forge, first error: {!r}'.format(
+                                                        len(errors), nthreads, errors[0]))
+
+    after = _core._code_cache.info()
+    counters = {k: after[k] - before[k] for k in ('hits', 'misses', 'waits')}
+    return seconds, nthreads * len(shapes) * 3, counters
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) use fewer threads and signatures
+
+    Returns:
+        a list of result records
+    '''
+    shapes = [(n, star_args, star_kwargs) for n, _, star_args, star_kwargs in _signatures.cases(quick)]
+
+    results = []
+    for nthreads in ((1, 8) if quick else (1, 4, 16, 32)):
+        seconds, forges, counters = _stress(nthreads, shapes)
+        params = {'nthreads': nthreads}
+        results.append(_common.record('concurrent_forge.throughput', 'forged', forges / seconds,
+                                      'forges/s', **params))
+        for counter, value in sorted(counters.items()):
+            results.append(_common.record('concurrent_forge.code_cache', counter, value, 'sources', **params))
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
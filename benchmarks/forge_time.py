@@ -0,0 +1,136 @@
+'''
+Time spent forging code with dictionarize, ParameterPack.pack and
+argshandler(...).serve, per decorated function, and for a codebase that
+decorates thousands of functions.
+'''
+# --- built in ---
+import json
+import time
+import inspect
+
+# --- 3rd party ---
+
+# --- my module ---
+import forge
+from forge import dictionarize
+from forge import ParameterPack
+from forge import argshandler
+from forge import _core
+from . import _common
+from . import _signatures
+
+
+def _forge_dictionarize(functions):
+    for function in functions:
+        dictionarize(function, inputs=['p0'])
+
+def _forge_pack(functions):
+    for function in functions:
+        ParameterPack.pack(lazy=False)(function)
+
+def _decorate_pack_lazy(functions):
+    # the import-time cost of a lazy pack, forging happens on the first call
+    for function in functions:
+        ParameterPack.pack()(function)
+
+def _forge_serve(handler, functions):
+    for function in functions:
+        handler.serve()(function)
+
+def _forge_codebase(methods, functions, handler_sig):
+    # every method is packed and served, every function is dictionarized twice
+    # and every module of 50 functions creates its own handler for the same signature
+    for i, (method, function) in enumerate(zip(methods, functions)):
+        if i % 50 == 0:
+            handler = argshandler(sig=handler_sig)
+        ParameterPack.pack(lazy=False)(method)
+        handler.serve()(method)
+        dictionarize(function, inputs=['p1'])
+        dictionarize(function, inputs=['p2'])
+
+def _codebase(quick):
+    '''
+    Forge time of a codebase of thousands of functions with a few signature shapes
+    '''
+    count = 500 if quick else 2000
+    shapes = [(n, star_args, star_kwargs) for n, _, star_args, star_kwargs in _signatures.cases(quick)
+                                          if n >= 5]
+    handler_sig = ', '.join(['self'] + _signatures.names(2))
+
+    def functions(first=None):
+        return [_signatures.make_function(*shapes[i % len(shapes)], first=first, name='target{}'.format(i))
+                    for i in range(count)]
+
+    seconds = float('inf')
+    for _ in range(3):
+        ms, fs = functions('self'), functions()
+        start = time.perf_counter()
+        _forge_codebase(ms, fs, handler_sig)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    function = fs[0]
+    return [
+        _common.record('forge_time.codebase', 'forged', seconds * 1e3, 'ms', nfunctions=count),
+        _common.record('forge_time.codebase', 'forged', seconds / count * 1e6, 'us/function',
+                       nfunctions=count),
+        _common.record('forge_time.signature', 'inspect', _common.ns_per_call(
+                           lambda: inspect.signature(function), 10000, repeat=3), 'ns/call'),
+        _common.record('forge_time.signature', 'cached', _common.ns_per_call(
+                           lambda: _core._signature_info(function), 10000, repeat=3), 'ns/call'),
+    ]
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) measure fewer signatures with fewer repeats
+
+    Returns:
+        a list of result records
+    '''
+    count = 20 if quick else 100
+    repeat = 3 if quick else 5
+
+    results = []
+    registry_size = forge.dictionarize_registry_info()['maxsize']
+    # measure forging, not registry lookups
+    forge.set_dictionarize_registry_size(0)
+
+    try:
+        for n, variant, star_args, star_kwargs in _signatures.cases(quick):
+
+            def functions(first=None):
+                return [_signatures.make_function(n, star_args, star_kwargs, first=first)
+                            for _ in range(count)]
+
+            # serve the first half of the parameters
+            served = ['self'] + _signatures.names(n)[:n//2]
+            handler = argshandler(sig=', '.join(served))
+
+            apis = [
+                ('dictionarize', _forge_dictionarize, functions),
+                ('pack', _forge_pack, lambda: functions('self')),
+                ('pack_lazy', _decorate_pack_lazy, lambda: functions('self')),
+                ('serve', lambda fs: _forge_serve(handler, fs), lambda: functions('self')),
+            ]
+
+            for api, forge_all, make in apis:
+                seconds = float('inf')
+                for _ in range(repeat):
+                    fs = make()
+                    start = time.perf_counter()
+                    forge_all(fs)
+                    seconds = min(seconds, time.perf_counter() - start)
+                results.append(_common.record('forge_time.' + api, 'forged', seconds / count * 1e6,
+                                              'us/forge', nparams=n, signature=variant))
+    finally:
+        forge.set_dictionarize_registry_size(registry_size)
+
+    results.extend(_codebase(quick))
+
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
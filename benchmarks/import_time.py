@@ -0,0 +1,129 @@
+'''
+Import time of forge, measured in fresh interpreters with -X importtime.
+
+Each statement of BUDGETS is timed as the cumulative import time of the
+modules it imports on top of interpreter startup. `python -m forge.benchmarks
+budget` fails if the best of several runs exceeds the budget.
+'''
+# --- built in ---
+import os
+import sys
+import json
+import subprocess
+
+# --- 3rd party ---
+
+# --- my module ---
+import forge
+from . import _common
+
+
+# import time budgets, in us. forge loads its submodules on first access, so
+# `import forge` alone must stay close to free, the APIs mostly pay for inspect
+BUDGETS = {
+    'import forge': 1000,
+    'from forge import dictionarize': 35000,
+    'from forge import ParameterPack': 35000,
+    'from forge import argshandler': 35000,
+    'from forge import PackBatch': 35000,
+}
+
+
+def importtime(statement='import forge'):
+    '''
+    Run `statement` in a fresh interpreter and return the -X importtime report
+
+    Returns:
+        a list of (module name, depth, self, cumulative) in import order, times in us
+    '''
+    env = dict(os.environ)
+    parent = os.path.dirname(os.path.dirname(os.path.abspath(forge.__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [parent, env.get('PYTHONPATH')]))
+
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                          env=env, capture_output=True, text=True, check=True)
+
+    report = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        try:
+            self_us, cumulative_us = int(fields[0]), int(fields[1])
+        except ValueError:
+            # header
+            continue
+        # nested imports are indented by 2 spaces per level
+        name = fields[2][1:]
+        depth = (len(name) - len(name.lstrip())) // 2
+        report.append((name.strip(), depth, self_us, cumulative_us))
+    return report
+
+def statement_time(statement, startup=None):
+    '''
+    Return the import time of `statement` in a fresh interpreter, in us
+
+    Args:
+        statement: (str) python statement
+        startup: (set of str) modules imported by the interpreter startup,
+            default to the modules imported by `pass`
+    '''
+    if startup is None:
+        startup = {name for name, _, _, _ in importtime('pass')}
+
+    return sum(cumulative for name, depth, _, cumulative in importtime(statement)
+                    if depth == 0 and name not in startup)
+
+def check(quick=False):
+    '''
+    Time the statements of BUDGETS
+
+    Args:
+        quick: (bool) use fewer interpreters
+
+    Returns:
+        a list of dicts with keys: statement, time, budget, exceeded
+    '''
+    repeat = 3 if quick else 10
+    startup = {name for name, _, _, _ in importtime('pass')}
+
+    rows = []
+    for statement, budget in BUDGETS.items():
+        best = min(statement_time(statement, startup) for _ in range(repeat))
+        rows.append({
+            'statement': statement,
+            'time': best,
+            'budget': budget,
+            'exceeded': best > budget,
+        })
+    return rows
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) use fewer interpreters
+
+    Returns:
+        a list of result records
+    '''
+    repeat = 3 if quick else 10
+    name = forge.__name__
+
+    reports = [{module: (self_us, cumulative_us) for module, _, self_us, cumulative_us in importtime()}
+                    for _ in range(repeat)]
+
+    results = [
+        _common.record('import_time.forge', 'self', min(r[name][0] for r in reports), 'us'),
+        _common.record('import_time.forge', 'cumulative', min(r[name][1] for r in reports), 'us'),
+    ]
+
+    for row in check(quick):
+        results.append(_common.record('import_time.statement', 'cumulative', row['time'], 'us',
+                                      statement=row['statement'], budget=row['budget']))
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
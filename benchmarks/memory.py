@@ -0,0 +1,127 @@
+'''
+Memory footprint of instances created through dictionarize and
+ParameterPack.pack, compared with hand-written equivalents.
+'''
+# --- built in ---
+import gc
+import json
+import weakref
+import tracemalloc
+
+# --- 3rd party ---
+
+# --- my module ---
+from forge import dictionarize
+from forge import ParameterPack
+from . import _common
+from . import _signatures
+
+
+_handwritten_template = '''\
+class Handwritten():
+    __slots__ = ({slots})
+
+    def __init__(self, {init_params}):
+{assignments}
+'''
+
+
+def bytes_per_instance(make, count):
+    '''
+    Return the memory allocated by make() on average, in bytes
+    '''
+    gc.collect()
+    tracemalloc.start()
+    try:
+        objs = [make() for _ in range(count)]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # the list holding the instances is not part of the footprint
+    size -= objs.__sizeof__()
+    del objs
+    return size / count
+
+def freed_by_refcount(make):
+    '''
+    Return whether the instance returned by make() is freed as soon as its last
+    reference is dropped, i.e. without the cyclic garbage collector
+    '''
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        obj = make()
+        ref = weakref.ref(obj)
+        del obj
+        return ref() is None
+    finally:
+        if enabled:
+            gc.enable()
+
+def check():
+    '''
+    Check that the instances of each pack mode are freed by reference counting
+
+    Returns:
+        a list of dicts with keys: mode, freed (bool)
+    '''
+    method = _signatures.make_function(3, True, True, first='self')
+
+    rows = []
+    for mode, options in (('default', {}), ('compact', {'compact': True}),
+                          ('intern', {'intern': True}), ('view', {'view': True})):
+        klass = type(mode, (), {'__init__': ParameterPack.pack(**options)(method)})
+        rows.append({'mode': mode, 'freed': freed_by_refcount(lambda: klass(0, 1, 2))})
+    return rows
+
+def _handwritten(params, star_args, star_kwargs, first=None):
+    fields = list(params) + (['args'] if star_args else []) + (['kwargs'] if star_kwargs else [])
+    source = _handwritten_template.format(
+        slots=''.join('{!r}, '.format(f) for f in fields),
+        init_params=_signatures.param_list(params, star_args, star_kwargs),
+        assignments='\n'.join('        self.{0} = {0}'.format(f) for f in fields) or '        pass')
+    return _signatures.build(source, 'Handwritten')
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) measure fewer signatures with fewer instances
+
+    Returns:
+        a list of result records
+    '''
+    count = 2000 if quick else 10000
+
+    results = []
+    for n, variant, star_args, star_kwargs in _signatures.cases(quick):
+        values = tuple(range(n))
+        Handwritten = _handwritten(_signatures.names(n), star_args, star_kwargs)
+
+        # dictionarize: p0 is the input, the others are stored
+        target = _signatures.make_function(n, star_args, star_kwargs)
+        Dictionarized = dictionarize(target, inputs=['p0'])
+        Stored = _handwritten(_signatures.names(n)[1:], star_args, star_kwargs)
+
+        # pack
+        method = _signatures.make_function(n, star_args, star_kwargs, first='self')
+        Default = type('Default', (), {'__init__': ParameterPack.pack()(method)})
+        Compact = type('Compact', (), {'__init__': ParameterPack.pack(compact=True)(method)})
+
+        cases = [
+            ('dictionarize', 'forged', lambda: Dictionarized(*values[1:])),
+            ('dictionarize', 'handwritten', lambda: Stored(*values[1:])),
+            ('pack', 'forged', lambda: Default(*values)),
+            ('pack', 'compact', lambda: Compact(*values)),
+            ('pack', 'handwritten', lambda: Handwritten(*values)),
+        ]
+
+        for api, name, make in cases:
+            results.append(_common.record('memory.' + api, name, bytes_per_instance(make, count),
+                                          'bytes/instance', nparams=n, signature=variant))
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
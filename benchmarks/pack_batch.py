@@ -0,0 +1,62 @@
+'''
+Filtering and aggregating many packs with PackBatch compared with a loop
+over the ParameterPack objects.
+'''
+# --- built in ---
+import json
+
+# --- 3rd party ---
+
+# --- my module ---
+from forge import ParameterPack, PackBatch
+from . import _common
+
+
+class Default():
+    @ParameterPack.pack(name='args', lazy=False)
+    def __init__(self, a, b, c=None, d=1.5):
+        pass
+
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) use fewer packs
+
+    Returns:
+        a list of result records
+    '''
+    count = 10000 if quick else 100000
+    packs = [Default(i, 'name{}'.format(i % 10), d=i / 3).args for i in range(count)]
+
+    results = []
+    results.append(_common.record('pack_batch.build', 'batch',
+                                  _common.best_of(lambda: PackBatch(packs), repeat=3) * 1e3, 'ms',
+                                  npacks=count))
+
+    for use_numpy in (True, False):
+        batch = PackBatch(packs, use_numpy=use_numpy)
+        variant = 'batch_numpy' if batch._numpy is not None else 'batch_lists'
+        if use_numpy and batch._numpy is None:
+            # numpy is not installed
+            continue
+
+        def query():
+            selected = batch.filter(a=lambda a: a > count // 2)
+            return selected.aggregate('d', 'sum')
+
+        results.append(_common.record('pack_batch.filter_sum', variant,
+                                      _common.best_of(query, repeat=3) * 1e3, 'ms', npacks=count))
+
+    def loop():
+        return sum(pack.d for pack in packs if pack.a > count // 2)
+
+    results.append(_common.record('pack_batch.filter_sum', 'loop',
+                                  _common.best_of(loop, repeat=3) * 1e3, 'ms', npacks=count))
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,71 @@
+'''
+Per-call cost of a pipeline of dictionarized stages: the fused function forged
+by forge.pipeline compared with calling the stages in sequence and with
+hand-written direct calls.
+'''
+# --- built in ---
+import json
+
+# --- 3rd party ---
+
+# --- my module ---
+import forge
+from forge import dictionarize
+from . import _common
+from . import _signatures
+
+
+def _stages(nstages, n):
+    '''
+    Create `nstages` dictionarized instances of functions of `n` parameters, the
+    first parameter p0 is the input
+    '''
+    functions = [_signatures.make_function(n, False, False, name='stage{}'.format(i)) for i in range(nstages)]
+    return functions, [dictionarize(function, inputs=['p0'])(*range(1, n)) for function in functions]
+
+def _handwritten(functions, n):
+    # the function a developer would write to chain the stages by hand
+    calls = 'p0'
+    for i in range(len(functions)):
+        calls = 'stage{}({})'.format(i, ', '.join([calls] + [str(v) for v in range(1, n)]))
+    source = 'def handwritten(p0):\n    return {}\n'.format(calls)
+    return _signatures.build(source, 'handwritten', {'stage{}'.format(i): f for i, f in enumerate(functions)})
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) use fewer stage counts and calls
+
+    Returns:
+        a list of result records
+    '''
+    number = 20000 if quick else 200000
+    repeat = 3 if quick else 5
+
+    results = []
+    for nstages in ((2, 8) if quick else (2, 4, 8)):
+        for n in ((1, 10) if quick else (1, 5, 10)):
+            functions, stages = _stages(nstages, n)
+            fused = forge.pipeline(*stages)
+            handwritten = _handwritten(functions, n)
+
+            def sequential(stages=stages):
+                value = 0
+                for stage in stages:
+                    value = stage(value)
+                return value
+
+            for variant, call in (('fused', lambda: fused(0)),
+                                  ('sequential', sequential),
+                                  ('handwritten', lambda: handwritten(0))):
+                results.append(_common.record('pipeline.call', variant,
+                                              _common.ns_per_call(call, number, repeat=repeat),
+                                              'ns/call', nstages=nstages, nparams=n))
+
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
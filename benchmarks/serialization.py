@@ -0,0 +1,109 @@
+'''
+Encoding and decoding time and size of to_bytes()/from_bytes() and
+dump_many()/load_many() compared with pickle.
+'''
+# --- built in ---
+import io
+import json
+import pickle
+
+# --- 3rd party ---
+
+# --- my module ---
+import forge
+from forge import ParameterPack
+from . import _common
+
+
+class Default():
+    @ParameterPack.pack(name='args', lazy=False)
+    def __init__(self, a, b, c=None, d=1.5, **kwargs):
+        pass
+
+class Compact():
+    @ParameterPack.pack(name='args', compact=True, lazy=False)
+    def __init__(self, a, b, c=None, d=1.5, **kwargs):
+        pass
+
+
+def _stream(packs, cls):
+    results = []
+
+    def dump():
+        buf = io.BytesIO()
+        forge.dump_many(packs, buf)
+        return buf
+
+    data = dump().getvalue()
+    results.append(_common.record('serialization.dump_many', 'forge',
+                                  _common.best_of(dump, repeat=3) / len(packs) * 1e9, 'ns/pack'))
+    results.append(_common.record('serialization.load_many', 'forge',
+                                  _common.best_of(lambda: list(forge.load_many(io.BytesIO(data), cls)),
+                                                  repeat=3) / len(packs) * 1e9, 'ns/pack'))
+    results.append(_common.record('serialization.stream_size', 'forge', len(data) / len(packs), 'bytes/pack'))
+
+    # pickle cannot resolve forged pack classes, pickle their ParameterPack equivalent
+    plain = [pack if isinstance(pack, ParameterPack) else pack._asdict() for pack in packs]
+
+    def pickle_dump():
+        buf = io.BytesIO()
+        for pack in plain:
+            pickle.dump(pack, buf)
+        return buf
+
+    def pickle_load(data):
+        buf = io.BytesIO(data)
+        return [pickle.load(buf) for _ in plain]
+
+    data = pickle_dump().getvalue()
+    results.append(_common.record('serialization.dump_many', 'pickle',
+                                  _common.best_of(pickle_dump, repeat=3) / len(packs) * 1e9, 'ns/pack'))
+    results.append(_common.record('serialization.load_many', 'pickle',
+                                  _common.best_of(lambda: pickle_load(data), repeat=3) / len(packs) * 1e9, 'ns/pack'))
+    results.append(_common.record('serialization.stream_size', 'pickle', len(data) / len(packs), 'bytes/pack'))
+
+    for record in results:
+        record['params']['pack'] = cls.__name__ if cls is ParameterPack else 'compact'
+    return results
+
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) use fewer packs and calls
+
+    Returns:
+        a list of result records
+    '''
+    count = 2000 if quick else 20000
+    number = 2000 if quick else 20000
+
+    results = []
+
+    pack = Default(1, 'name', flag=True).args
+    data = pack.to_bytes()
+    pickled = pickle.dumps(pack)
+    results.append(_common.record('serialization.to_bytes', 'forge',
+                                  _common.ns_per_call(pack.to_bytes, number, repeat=3), 'ns/call'))
+    results.append(_common.record('serialization.to_bytes', 'pickle',
+                                  _common.ns_per_call(lambda: pickle.dumps(pack), number, repeat=3), 'ns/call'))
+    results.append(_common.record('serialization.from_bytes', 'forge',
+                                  _common.ns_per_call(lambda: ParameterPack.from_bytes(data), number, repeat=3),
+                                  'ns/call'))
+    results.append(_common.record('serialization.from_bytes', 'pickle',
+                                  _common.ns_per_call(lambda: pickle.loads(pickled), number, repeat=3), 'ns/call'))
+    results.append(_common.record('serialization.size', 'forge', len(data), 'bytes'))
+    results.append(_common.record('serialization.size', 'pickle', len(pickled), 'bytes'))
+
+    results.extend(_stream([Default(i, 'name{}'.format(i)).args for i in range(count)], ParameterPack))
+
+    compact = [Compact(i, 'name{}'.format(i)).args for i in range(count)]
+    results.extend(_stream(compact, type(compact[0])))
+
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))
@@ -0,0 +1,76 @@
+'''
+Lookup cost of ParameterPack at each warning level compared with OrderedDict,
+and the cost of a repeated missing key lookup at the warning levels.
+'''
+# --- built in ---
+import json
+import logging
+from collections import OrderedDict
+
+# --- 3rd party ---
+
+# --- my module ---
+from forge import ParameterPack
+from forge import set_parameterpack_warning_level
+from forge import reset_parameterpack_warnings
+from . import _common
+
+
+class _Subclass(OrderedDict):
+    pass
+
+
+def run(quick=False):
+    '''
+    Run the benchmark
+
+    Args:
+        quick: (bool) use fewer lookups per measurement
+
+    Returns:
+        a list of result records
+    '''
+    number = 200000 if quick else 2000000
+
+    items = [('x', 1), ('y', 2), ('z', 3)]
+    namespace = {'od': OrderedDict(items), 'sub': _Subclass(items), 'pack': ParameterPack(items)}
+
+    def measure(stmt):
+        return _common.ns_per_call(stmt, number, namespace=namespace)
+
+    # any OrderedDict subclass pays for the generic subscript path, so
+    # `ordereddict_subclass` is the floor ParameterPack can reach
+    results = [
+        _common.record('warning_level.getitem', 'ordereddict', measure("od['y']"), 'ns/lookup'),
+        _common.record('warning_level.getitem', 'ordereddict_subclass', measure("sub['y']"), 'ns/lookup'),
+    ]
+
+    try:
+        for level in (0, 1, 3):
+            set_parameterpack_warning_level(level)
+            variant = 'level{}'.format(level)
+            results.append(_common.record('warning_level.getitem', variant, measure("pack['y']"), 'ns/lookup'))
+            results.append(_common.record('warning_level.getattr', variant, measure('pack.y'), 'ns/lookup'))
+
+        # missing keys are logged once per call site, then counted
+        logger = logging.getLogger('forge')
+        disabled, logger.disabled = logger.disabled, True
+        try:
+            for level in (1, 2, 3):
+                set_parameterpack_warning_level(level)
+                variant = 'level{}'.format(level)
+                results.append(_common.record('warning_level.getitem_missing', variant,
+                                              measure("pack['missing']"), 'ns/lookup'))
+                results.append(_common.record('warning_level.getattr_missing', variant,
+                                              measure('pack.missing'), 'ns/lookup'))
+        finally:
+            logger.disabled = disabled
+            reset_parameterpack_warnings()
+    finally:
+        set_parameterpack_warning_level(0)
+
+    return results
+
+
+if __name__ == '__main__':
+    print(json.dumps(run(), indent=2))